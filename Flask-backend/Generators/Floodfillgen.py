@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import List, Optional, Tuple, Set, Dict
 import random
 from collections import deque
+from operator import xor
 
 Coord = Tuple[int, int]
 
@@ -22,7 +23,7 @@ Coord = Tuple[int, int]
 #
 # This generator:
 #   - creates a random board
-#   - (optionally) searches for a solution within move_limit using a depth-limited DFS
+#   - (optionally) searches for a solution within move_limit (pivot IDA*, then a bounded free search)
 #   - returns the board + move_limit (+ optional solution for debugging)
 #
 # NOTE: This is a generator only; your Swift frontend can implement scoring/UX.
@@ -38,6 +39,8 @@ class MosaicPuzzle:
     grid: List[List[int]]                 # color indices 0..num_colors-1
     solution: Optional[List[Tuple[int,int,int]]] = None
     # solution is list of moves (r, c, new_color) that solves within move_limit (if ensure_solvable=True)
+    optimal_moves: Optional[int] = None
+    # optimal_moves is the proven minimum number of moves (None if not computed or not proven)
 
 
 # ----------------------------
@@ -64,164 +67,531 @@ def _component(grid: List[List[int]], sr: int, sc: int) -> Set[Coord]:
     return seen
 
 
-def _apply_move(
-    grid: List[List[int]],
-    sr: int,
-    sc: int,
-    new_color: int,
-) -> List[List[int]]:
-    """Return a new grid after repainting the component at (sr,sc) to new_color."""
-    rows, cols = len(grid), len(grid[0])
-    old = grid[sr][sc]
-    if new_color == old:
-        return grid  # no-op (caller should avoid)
-
-    comp = _component(grid, sr, sc)
-    out = [row[:] for row in grid]
-    for r, c in comp:
-        out[r][c] = new_color
-    return out
-
-
 def _is_solved(grid: List[List[int]]) -> bool:
     first = grid[0][0]
     return all(cell == first for row in grid for cell in row)
 
 
-def _grid_key(grid: List[List[int]]) -> Tuple[int, ...]:
-    return tuple(cell for row in grid for cell in row)
+# ----------------------------
+# Region adjacency graph
+# ----------------------------
+# The board is compressed once into its same-color components ("regions").
+# Search states are lists of groups, each a tuple (mask, color, adj, keys):
+#   mask  - bitmask of the regions in the group
+#   color - current color of the group
+#   adj   - bitmask of regions adjacent to the group (outside it)
+#   keys  - per color c, XOR of the Zobrist keys of (region, c) over the group
+# Region ids never change, so a move only ORs masks together: recoloring a group
+# merges it with every neighboring group of the new color.
+#
+# A state is hashed as the XOR of zobrist[region][color] over all regions.
+# Recoloring a group from old to new changes it by keys[old] ^ keys[new];
+# merging changes nothing (the merged groups already have the new color).
+Group = Tuple[int, int, int, Tuple[int, ...]]
+_ZOBRIST_SEED = 0x5EED_F100D
+
+
+class _RegionGraph:
+    __slots__ = ("colors", "cells", "neighbors", "zobrist")
+
+    def __init__(self, grid: List[List[int]], num_colors: int) -> None:
+        rows, cols = len(grid), len(grid[0])
+        region_of = [[-1] * cols for _ in range(rows)]
+        self.colors: List[int] = []     # starting color of each region
+        self.cells: List[Coord] = []    # one representative cell per region
+        for r in range(rows):
+            for c in range(cols):
+                if region_of[r][c] < 0:
+                    rid = len(self.colors)
+                    for rr, cc in _component(grid, r, c):
+                        region_of[rr][cc] = rid
+                    self.colors.append(grid[r][c])
+                    self.cells.append((r, c))
+
+        self.neighbors: List[int] = [0] * len(self.colors)
+        for r in range(rows):
+            for c in range(cols):
+                a = region_of[r][c]
+                for rr, cc in ((r + 1, c), (r, c + 1)):
+                    if rr < rows and cc < cols:
+                        b = region_of[rr][cc]
+                        if a != b:
+                            self.neighbors[a] |= 1 << b
+                            self.neighbors[b] |= 1 << a
+
+        zrng = random.Random(_ZOBRIST_SEED)
+        self.zobrist: List[Tuple[int, ...]] = [
+            tuple(zrng.getrandbits(64) for _ in range(num_colors)) for _ in self.colors
+        ]
+
+    def start_groups(self) -> List[Group]:
+        return [
+            (1 << i, color, self.neighbors[i], self.zobrist[i])
+            for i, color in enumerate(self.colors)
+        ]
+
+    def start_hash(self) -> int:
+        h = 0
+        for keys, color in zip(self.zobrist, self.colors):
+            h ^= keys[color]
+        return h
+
+    def cell_of(self, mask: int) -> Coord:
+        """A cell inside the group (its lowest region's representative)."""
+        return self.cells[(mask & -mask).bit_length() - 1]
+
+
+def _color_masks(groups: List[Group], num_colors: int) -> List[int]:
+    """Regions currently holding each color."""
+    out = [0] * num_colors
+    for mask, color, _, _ in groups:
+        out[color] |= mask
+    return out
 
 
-def _count_colors(grid: List[List[int]]) -> int:
-    return len(set(cell for row in grid for cell in row))
+def _recolor(groups: List[Group], i: int, new_color: int) -> List[Group]:
+    """Groups after recoloring groups[i]; neighbors of new_color merge into it."""
+    mask, _, adj, keys = groups[i]
+    touch = adj
+    out: List[Group] = []
+    for j, g in enumerate(groups):
+        if j == i:
+            continue
+        if g[1] == new_color and g[0] & touch:
+            mask |= g[0]
+            adj |= g[2]
+            keys = tuple(map(xor, keys, g[3]))
+        else:
+            out.append(g)
+    out.append((mask, new_color, adj & ~mask, keys))
+    return out
 
 
-def _boundary_seeds(grid: List[List[int]]) -> List[Coord]:
+class _TranspositionTable:
     """
-    Return representative cells likely to be useful moves:
-    cells that sit on a boundary between different colors.
+    Fixed-size table of states proven unsolvable within `depth` moves, keyed by
+    Zobrist hash. Two-way buckets: a probe checks both slots; a store updates a
+    matching slot or replaces the one with the smaller proven depth, so deep
+    (expensive) proofs survive and memory never grows during a search.
     """
-    rows, cols = len(grid), len(grid[0])
-    seeds: List[Coord] = []
-    for r in range(rows):
-        for c in range(cols):
-            col = grid[r][c]
-            for dr, dc in ((1,0), (-1,0), (0,1), (0,-1)):
-                rr, cc = r + dr, c + dc
-                if _inb(rr, cc, rows, cols) and grid[rr][cc] != col:
-                    seeds.append((r, c))
-                    break
-    return seeds or [(0, 0)]
-
-
-def _neighbor_colors(grid: List[List[int]], comp: Set[Coord]) -> Set[int]:
-    """Colors that touch the component by an edge (useful recolor targets)."""
-    rows, cols = len(grid), len(grid[0])
-    out: Set[int] = set()
-    for r, c in comp:
-        for dr, dc in ((1,0), (-1,0), (0,1), (0,-1)):
-            rr, cc = r + dr, c + dc
-            if _inb(rr, cc, rows, cols) and (rr, cc) not in comp:
-                out.add(grid[rr][cc])
-    return out
+
+    __slots__ = ("mask", "keys", "depths")
+
+    def __init__(self, size: int) -> None:
+        size = 1 << max(1, (size - 1).bit_length())  # power of two
+        self.mask = size - 2  # even slot of a bucket
+        self.keys = [0] * size
+        self.depths = [-1] * size
+
+    def probe(self, h: int) -> int:
+        i = h & self.mask
+        if self.keys[i] == h:
+            return self.depths[i]
+        if self.keys[i + 1] == h:
+            return self.depths[i + 1]
+        return -1
+
+    def store(self, h: int, depth: int) -> None:
+        i = h & self.mask
+        keys, depths = self.keys, self.depths
+        if keys[i] == h or (keys[i + 1] != h and depths[i] <= depths[i + 1]):
+            slot = i
+        else:
+            slot = i + 1
+        if keys[slot] != h or depths[slot] < depth:
+            keys[slot] = h
+            depths[slot] = depth
+
+
+def _eccentricity(groups: List[Group], start: int) -> Tuple[int, int]:
+    """BFS depth of the group graph from groups[start], and a group at that depth."""
+    reach = groups[start][2]
+    rest = list(range(len(groups)))
+    del rest[start]
+    ecc = 0
+    farthest = start
+    while rest:
+        ecc += 1
+        nxt = 0
+        keep: List[int] = []
+        for j in rest:
+            if groups[j][0] & reach:
+                nxt |= groups[j][2]
+                farthest = j
+            else:
+                keep.append(j)
+        rest = keep
+        reach = nxt
+    return ecc, farthest
+
+
+def _moves_lower_bound(groups: List[Group], color_masks: List[int]) -> int:
+    """
+    Admissible bound on the moves still needed:
+      - a move removes at most one color from the board, so >= distinct - 1
+      - a move contracts a group with some of its neighbors (a star of radius 1),
+        so no graph distance shrinks by more than 2: >= ceil(d / 2) for the
+        distance d found by a double BFS sweep from the largest group
+    """
+    distinct = len(color_masks) - color_masks.count(0)
+    largest = max((g[0].bit_count(), i) for i, g in enumerate(groups))[1]
+    ecc, farthest = _eccentricity(groups, largest)
+    if (ecc + 1) // 2 > distinct - 1:
+        ecc = max(ecc, _eccentricity(groups, farthest)[0])
+    return max(distinct - 1, (ecc + 1) // 2)
+
+
+def _one_move_solution(groups: List[Group]) -> Optional[Tuple[int, int]]:
+    """(group index, color) that finishes the board in one move, if any."""
+    for i, (_, color, adj, _) in enumerate(groups):
+        target = groups[1][1] if i == 0 else groups[0][1]
+        if target != color and all(
+            g[1] == target and g[0] & adj for j, g in enumerate(groups) if j != i
+        ):
+            return i, target
+    return None
 
 
 # ----------------------------
-# Depth-limited solver (used only for generation)
+# Solver (used only for generation)
 # ----------------------------
+_PIVOTS_TRIED = 3
 
-def _find_solution_within(
-    start: List[List[int]],
-    num_colors: int,
-    move_limit: int,
-    rng: random.Random,
-    *,
-    node_limit: int = 200_000,
-) -> Optional[List[Tuple[int, int, int]]]:
-    """
-    Try to find any solution within move_limit moves using DFS + pruning.
+Move = Tuple[int, int, int]  # (r, c, new_color)
 
-    Pruning heuristics:
-      - If number of distinct colors > remaining_moves + 1, impossible (each move can eliminate
-        at most one color in best case).
-      - Prefer moves that recolor a component into a neighboring color (merges components).
-      - Only consider boundary components (likely to merge).
+
+class _FloodSearch:
+    """
+    Search state shared by the solver passes on one board: the region graph,
+    the start groups and bound, a node budget and a fixed-size Zobrist
+    transposition table of states proven unsolvable within some number of
+    moves (valid across passes, so later passes reuse earlier proofs).
     """
-    seen: Dict[Tuple[Tuple[int, ...], int], int] = {}
-    nodes = 0
 
-    def dfs(grid: List[List[int]], depth_left: int) -> Optional[List[Tuple[int, int, int]]]:
-        nonlocal nodes
-        nodes += 1
-        if nodes > node_limit:
+    def __init__(
+        self,
+        start: List[List[int]],
+        num_colors: int,
+        rng: random.Random,
+        node_limit: int,
+        tt_size: int,
+    ) -> None:
+        self.graph = _RegionGraph(start, num_colors)
+        self.num_colors = num_colors
+        self.rng = rng
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.table = _TranspositionTable(tt_size)  # state -> most moves proven not enough
+        self.groups = self.graph.start_groups()
+        self.start_hash = self.graph.start_hash()
+        self.lower = _moves_lower_bound(self.groups, _color_masks(self.groups, num_colors))
+        self.pivot_salt: Dict[int, int] = {}
+
+    @property
+    def exhausted(self) -> bool:
+        return self.nodes > self.node_limit
+
+    def pivot_solution(self, move_limit: int) -> Optional[List[Move]]:
+        """
+        Pivot IDA*: flood from one of the most central groups only, with the
+        bound growing from the start board's lower bound. Only the pivot grows,
+        so its eccentricity is itself a lower bound, and branching is at most
+        num_colors - 1. Returns the shortest pivot solution found.
+        """
+        groups = self.groups
+        central = sorted(
+            range(len(groups)),
+            key=lambda i: (_eccentricity(groups, i)[0], -groups[i][0].bit_count()),
+        )[:_PIVOTS_TRIED]
+        pivots = [groups[i][0] & -groups[i][0] for i in central]  # one region bit each
+        zrng = random.Random(_ZOBRIST_SEED ^ 1)
+        self.pivot_salt = {pivot: zrng.getrandbits(64) for pivot in pivots}
+        for bound in range(self.lower, move_limit + 1):
+            for pivot in pivots:
+                res = self._pivot_dfs(groups, self.start_hash, pivot, bound)
+                if res is not None:
+                    return res
+                if self.exhausted:
+                    return None
+        return None
+
+    def free_solution(self, move_limit: int) -> Optional[List[Move]]:
+        """
+        Any group may be recolored; a depth-first pass with
+        moves-so-far + _moves_lower_bound <= move_limit (one IDA* pass).
+        """
+        if move_limit < self.lower:
             return None
+        return self._dfs(self.groups, self.start_hash, move_limit, 0, 0)
 
-        if _is_solved(grid):
+    def _pivot_dfs(self, groups: List[Group], h: int, pivot: int, depth_left: int) -> Optional[List[Move]]:
+        self.nodes += 1
+        if self.exhausted:
+            return None
+
+        if len(groups) == 1:
             return []
 
-        # simple necessary condition
-        distinct = _count_colors(grid)
-        if distinct > depth_left + 1:
+        num_colors = self.num_colors
+        table = self.table
+        key = h ^ self.pivot_salt[pivot]
+        if table.probe(key) >= depth_left:
             return None
-        if depth_left == 0:
+        color_masks = _color_masks(groups, num_colors)
+        p = next(i for i, g in enumerate(groups) if g[0] & pivot)
+        mask, old, adj, keys = groups[p]
+        distinct = num_colors - color_masks.count(0)
+        if distinct - 1 > depth_left or _eccentricity(groups, p)[0] > depth_left:
+            table.store(key, depth_left)
             return None
 
-        key = (_grid_key(grid), depth_left)
-        if key in seen:
+        moves: List[Tuple[int, int]] = []  # (score, new_color)
+        if distinct <= depth_left or color_masks[old] == mask:
+            for new_col in range(num_colors):
+                touching = adj & color_masks[new_col]
+                if new_col != old and touching:
+                    moves.append((touching.bit_count(), new_col))
+        moves.sort(reverse=True)
+
+        for _, new_col in moves:
+            res = self._pivot_dfs(
+                _recolor(groups, p, new_col), h ^ keys[old] ^ keys[new_col], pivot, depth_left - 1
+            )
+            if res is not None:
+                r, c = self.graph.cell_of(mask)
+                return [(r, c, new_col)] + res
+            if self.exhausted:
+                return None
+
+        table.store(key, depth_left)
+        return None
+
+    def _dfs(
+        self, groups: List[Group], h: int, depth_left: int, prev_low: int, prev_zone: int
+    ) -> Optional[List[Move]]:
+        """
+        prev_low / prev_zone describe the previous move: the lowest region bit of
+        the group it recolored and the regions of the merged group plus its
+        neighbors. A move on a group outside that zone commutes with it, so only
+        the order with increasing lowest region is searched.
+        """
+        self.nodes += 1
+        if self.exhausted:
             return None
-        seen[key] = 1
 
-        # Candidate seeds: boundary cells, shuffled
-        seeds = _boundary_seeds(grid)
-        rng.shuffle(seeds)
+        if len(groups) == 1:
+            return []
+
+        num_colors = self.num_colors
+        table = self.table
+        if table.probe(h) >= depth_left:
+            return None
+        color_masks = _color_masks(groups, num_colors)
+        if _moves_lower_bound(groups, color_masks) > depth_left:
+            table.store(h, depth_left)
+            return None
+        if depth_left == 1:
+            # last move: check it directly instead of expanding every recolor
+            last = _one_move_solution(groups)
+            if last is None:
+                table.store(h, 1)
+                return None
+            i, new_col = last
+            r, c = self.graph.cell_of(groups[i][0])
+            return [(r, c, new_col)]
 
         # Build candidate moves, score by "merge potential"
-        moves: List[Tuple[int, int, int, int]] = []  # (score, r, c, new_color)
-        for r, c in seeds[: min(len(seeds), 40)]:  # cap seeds to keep branching sane
-            comp = _component(grid, r, c)
-            old = grid[r][c]
-            ncols = _neighbor_colors(grid, comp)
-            if not ncols:
+        # A move removes a color only if its group is the last of that color; when
+        # the color count is already tight, no other group is worth recoloring.
+        tight = num_colors - color_masks.count(0) > depth_left
+        moves: List[Tuple[int, int, int]] = []  # (score, group index, new_color)
+        skipped = False
+        for i, (mask, old, adj, _) in enumerate(groups):
+            if tight and color_masks[old] != mask:
+                continue
+            if not mask & prev_zone and (mask & -mask) < prev_low:
+                skipped = True  # searched in the other order
                 continue
-            for new_col in ncols:
+            for new_col in range(num_colors):
                 if new_col == old:
                     continue
-                # score: how many boundary contacts already have new_col (approx merge gain)
-                score = 0
-                for rr, cc in comp:
-                    for dr, dc in ((1,0), (-1,0), (0,1), (0,-1)):
-                        r2, c2 = rr + dr, cc + dc
-                        if _inb(r2, c2, len(grid), len(grid[0])) and (r2, c2) not in comp:
-                            if grid[r2][c2] == new_col:
-                                score += 1
-                moves.append((score, r, c, new_col))
-
-        # If no neighbor-color moves, fall back to any recolor (rare)
-        if not moves:
-            r, c = seeds[0]
-            old = grid[r][c]
-            for new_col in range(num_colors):
-                if new_col != old:
-                    moves.append((0, r, c, new_col))
-
-        # Try best moves first
+                # score: neighboring regions that already have new_col (merge gain)
+                touching = adj & color_masks[new_col]
+                if touching:
+                    moves.append((touching.bit_count(), i, new_col))
+
+        # Try best moves first, with a little randomness at the top to diversify
+        rng = self.rng
+        rng.shuffle(moves)
         moves.sort(reverse=True, key=lambda x: x[0])
-        # Add a little randomness at the top to diversify
         top = moves[: min(12, len(moves))]
         rng.shuffle(top)
-        moves = top + moves[min(12, len(moves)) : min(40, len(moves))]
-
-        for _, r, c, new_col in moves:
-            nxt = _apply_move(grid, r, c, new_col)
-            if nxt is grid:  # no-op
-                continue
-            res = dfs(nxt, depth_left - 1)
+        moves[: len(top)] = top
+
+        for _, i, new_col in moves:
+            mask, old, _, keys = groups[i]
+            nxt = _recolor(groups, i, new_col)
+            merged = nxt[-1]
+            res = self._dfs(
+                nxt, h ^ keys[old] ^ keys[new_col], depth_left - 1, mask & -mask, merged[0] | merged[2]
+            )
             if res is not None:
+                r, c = self.graph.cell_of(mask)
                 return [(r, c, new_col)] + res
+            if self.exhausted:
+                return None
+
+        # a failure that relied on the ordering rule only holds for this path
+        if not skipped:
+            table.store(h, depth_left)
+        return None
+
+
+def _find_solution_within(
+    start: List[List[int]],
+    num_colors: int,
+    move_limit: int,
+    rng: random.Random,
+    *,
+    node_limit: int = 200_000,
+    tt_size: int = 1 << 16,
+) -> Optional[List[Move]]:
+    """
+    Find a solution of at most move_limit moves, or None.
+
+    Both phases run on the region adjacency graph (see _RegionGraph) and prune
+    with admissible bounds; states proven unsolvable within some number of
+    moves are remembered in a fixed-size Zobrist transposition table (tt_size
+    entries), so memory per search is bounded and hashing is O(num_colors) per move.
 
+      1) Pivot IDA* (see _FloodSearch.pivot_solution). Most solvable boards are
+         settled here.
+      2) Free search (see _FloodSearch.free_solution) with move_limit as the bound.
+         Moves recolor a group into a neighboring color (merges groups), best
+         merge first with a little randomness among the top moves.
+
+    None is also returned if node_limit is exhausted.
+    """
+    search = _FloodSearch(start, num_colors, rng, node_limit, tt_size)
+    if len(search.groups) == 1:
+        return []
+    if search.lower > move_limit:
         return None
+    res = search.pivot_solution(move_limit)
+    if res is None and not search.exhausted:
+        res = search.free_solution(move_limit)
+    return res
+
+
+def _optimal_solution(
+    start: List[List[int]],
+    num_colors: int,
+    max_moves: int,
+    rng: random.Random,
+    *,
+    known: Optional[List[Move]] = None,
+    node_limit: int = 200_000,
+    tt_size: int = 1 << 16,
+) -> Tuple[Optional[List[Move]], bool]:
+    """
+    Shortest solution of at most max_moves moves: (solution, proven).
+
+    Starts from `known` (or the pivot search) and runs free passes with the
+    bound one below the best solution so far until a pass fails, which proves
+    optimality. The transposition table carries proofs from pass to pass.
+    proven is False if node_limit ran out first; the solution is then just the
+    best found. (None, True) means there is no solution within max_moves.
+    """
+    search = _FloodSearch(start, num_colors, rng, node_limit, tt_size)
+    if len(search.groups) == 1:
+        return [], True
+    if search.lower > max_moves:
+        return None, True
+
+    best = known if known is not None and len(known) <= max_moves else None
+    if best is None:
+        best = search.pivot_solution(max_moves)
+    if best is None and not search.exhausted:
+        best = search.free_solution(max_moves)
+    if best is None:
+        return None, not search.exhausted
+
+    while len(best) > search.lower:
+        res = search.free_solution(len(best) - 1)
+        if res is None:
+            break
+        best = res
+    return best, not search.exhausted
+
+
+# ----------------------------
+# Reverse construction
+# ----------------------------
+
+def _reverse_board(
+    rows: int,
+    cols: int,
+    num_colors: int,
+    move_limit: int,
+    rng: random.Random,
+) -> Tuple[List[List[int]], List[Tuple[int, int, int]]]:
+    """
+    Build a board backwards from a solved one, returning (grid, solution).
+
+    Each step "splits" the board: a connected blob of one color b is repainted
+    to a color a that no cell around the blob has. On the resulting board the
+    blob is exactly one component, so tapping it and choosing b undoes the
+    step. The undo moves in reverse order solve the board in <= move_limit
+    moves. Cost is O(move_limit * rows * cols), with no search.
+    """
+    area = rows * cols
+    solved_color = rng.randrange(num_colors)
+    g = [[solved_color] * cols for _ in range(rows)]
+    undo: List[Tuple[int, int, int]] = []
+    max_blob = max(1, 2 * area // (move_limit + 1))
+
+    for _ in range(20 * move_limit):
+        if len(undo) == move_limit:
+            break
+        sr, sc = rng.randrange(rows), rng.randrange(cols)
+        b = g[sr][sc]
+
+        # grow a random blob of color b from (sr, sc)
+        target = rng.randint(1, max_blob)
+        blob: Set[Coord] = {(sr, sc)}
+        frontier = [(sr, sc)]
+        while frontier and len(blob) < target:
+            k = rng.randrange(len(frontier))
+            r, c = frontier[k]
+            nxt = [
+                (rr, cc)
+                for rr, cc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1))
+                if _inb(rr, cc, rows, cols) and (rr, cc) not in blob and g[rr][cc] == b
+            ]
+            if not nxt:
+                frontier[k] = frontier[-1]
+                frontier.pop()
+                continue
+            cell = rng.choice(nxt)
+            blob.add(cell)
+            frontier.append(cell)
+
+        # the new color must not touch the blob, or tapping would take more cells
+        border: Set[int] = set()
+        for r, c in blob:
+            for rr, cc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if _inb(rr, cc, rows, cols) and (rr, cc) not in blob:
+                    border.add(g[rr][cc])
+        choices = [a for a in range(num_colors) if a != b and a not in border]
+        if not choices:
+            continue
+        a = rng.choice(choices)
+        for r, c in blob:
+            g[r][c] = a
+        undo.append((sr, sc, b))
 
-    return dfs(start, move_limit)
+    undo.reverse()
+    return g, undo
 
 
 # ----------------------------
@@ -238,17 +608,33 @@ def generate_mosaic(
     ensure_solvable: bool = True,
     max_tries: int = 500,
     noise_blocks: int = 14,
+    construction: str = "random",
+    slack: Optional[int] = None,
+    optimal_node_limit: int = 30_000,
 ) -> MosaicPuzzle:
     """
     Generate a Mosaic puzzle board.
 
-    Generation strategy:
+    Generation strategy (construction="random"):
       1) Create a board by painting random "blobby" blocks (so it looks like regions).
       2) If ensure_solvable=True, search for a solution within move_limit.
          If not solvable, retry with a new random board.
 
+    construction="reverse" builds the board backwards from a solved one (see
+    _reverse_board), so it comes with a known solution and needs no search;
+    generation time does not depend on move_limit. noise_blocks is not used.
+
+    Whenever a solution is known, it is shortened to an optimal one and
+    optimal_moves is set, provided optimality can be proven within
+    optimal_node_limit search nodes (otherwise optimal_moves is None).
+    slack=k only accepts boards with a proven optimal_moves >= move_limit - k,
+    so slack=0 means the move limit leaves no room for mistakes. Proofs get
+    expensive past about 6 moves: 7-move optima on 10x10 take 100k-300k
+    nodes (a few seconds), 12x12 boards with 7+ moves usually need more.
+
     Returns:
-      MosaicPuzzle(grid=..., move_limit=..., solution=optional list of moves)
+      MosaicPuzzle(grid=..., move_limit=..., solution=optional list of moves,
+                   optimal_moves=proven minimum or None)
     """
     if rows <= 0 or cols <= 0:
         raise ValueError("rows and cols must be positive.")
@@ -256,6 +642,10 @@ def generate_mosaic(
         raise ValueError("num_colors must be >= 2.")
     if move_limit <= 0:
         raise ValueError("move_limit must be positive.")
+    if construction not in ("random", "reverse"):
+        raise ValueError("construction must be 'random' or 'reverse'.")
+    if slack is not None and not 0 <= slack < move_limit:
+        raise ValueError("slack must be between 0 and move_limit - 1.")
 
     rng = random.Random(seed)
 
@@ -276,18 +666,37 @@ def generate_mosaic(
         return g
 
     for _ in range(max_tries):
-        grid = make_board()
+        if construction == "reverse":
+            grid, known = _reverse_board(rows, cols, num_colors, move_limit, rng)
+        else:
+            grid, known = make_board(), None
 
         # avoid already-solved boards
         if _is_solved(grid):
             continue
 
         sol = None
-        if ensure_solvable:
+        if known is not None:
+            sol = known
+        elif ensure_solvable or slack is not None:
             sol = _find_solution_within(grid, num_colors, move_limit, rng)
             if sol is None:
                 continue
 
+        if slack is not None and len(sol) < move_limit - slack:
+            continue
+
+        optimal = None
+        if sol is not None:
+            best, proven = _optimal_solution(
+                grid, num_colors, len(sol), rng, known=sol, node_limit=optimal_node_limit
+            )
+            sol = best
+            if proven:
+                optimal = len(best)
+        if slack is not None and (optimal is None or optimal < move_limit - slack):
+            continue
+
         return MosaicPuzzle(
             rows=rows,
             cols=cols,
@@ -295,6 +704,7 @@ def generate_mosaic(
             move_limit=move_limit,
             grid=grid,
             solution=sol,
+            optimal_moves=optimal,
         )
 
     raise RuntimeError("Failed to generate a solvable Mosaic puzzle; try different seed/params.")
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import math
+import os
 import random
+import threading
 
 # ============================
 # "Tower" (Mastermind) SECRET generator
@@ -29,6 +34,7 @@ class MastermindSecret:
     config: MastermindConfig
     code: Code                   # each int in [0..num_colors-1]
     max_attempts: int            # UI can use this to render attempt rows / difficulty
+    solver_steps: Optional[int] = None  # guesses our solver needs (None if not checked)
 
 
 # ----------------------------
@@ -99,97 +105,561 @@ def _feedback(guess: Code, secret: Code, num_colors: int) -> Feedback:
 
 
 # ----------------------------
-# Solver used ONLY for "solvable within attempts" validation
+# Shared feedback matrix
 # ----------------------------
-def _solve_steps_needed(cfg: MastermindConfig, secret: Code) -> int:
+# Feedback is packed into one byte: fb = total + code_len * exact, where
+# total = exact + color_only. That is injective for 0 <= exact <= total <= code_len
+# and stays below 256 for code_len <= 15. A solved guess encodes to
+# code_len * (code_len + 1).
+def _encode_feedback(fb: Feedback, code_len: int) -> int:
+    exact, color_only = fb
+    return exact + color_only + code_len * exact
+
+
+def _decode_feedback(value: int, code_len: int) -> Feedback:
+    exact, total = divmod(value, code_len)
+    if total < exact:  # the only ambiguous split: total == code_len
+        exact, total = exact - 1, code_len
+    return exact, total - exact
+
+
+@lru_cache(maxsize=None)
+def _hit_table(digit: int) -> bytes:
+    return bytes(1 if d == digit else 0 for d in range(256))
+
+
+@lru_cache(maxsize=None)
+def _cap_table(limit: int) -> bytes:
+    return bytes(min(k, limit) for k in range(256))
+
+
+class _CodeColumns:
     """
-    Returns how many guesses a deterministic solver needs to find `secret`.
+    Column views over a list of codes (digit at each position, count of each color),
+    so the feedback of one guess against all of them is computed as a byte row.
 
-    Strategy:
-      - Maintain candidate set S of possible secrets.
-      - Pick a guess that minimizes the *worst-case* size of S after feedback (minimax).
-      - Guess from the universe of all codes (works well for small spaces like 4^4=256).
+    Per position / per color, bytes.translate maps every code's digit (or color
+    count) to its contribution, and the lanes are summed as one big int (all lane
+    sums stay < 256, so there is no carry between lanes).
     """
-    universe = _all_codes(cfg)
-    candidates = universe[:]  # possible secrets remaining
 
+    __slots__ = ("size", "code_len", "digits", "color_counts")
+
+    def __init__(self, codes: List[Code], code_len: int, num_colors: int) -> None:
+        self.size = len(codes)
+        self.code_len = code_len
+        self.digits = [bytes(code[i] for code in codes) for i in range(code_len)]
+        self.color_counts = [bytes(code.count(color) for code in codes) for color in range(num_colors)]
+
+    def feedback_row(self, guess: Code) -> bytes:
+        exact = 0
+        for pos, digit in enumerate(guess):
+            exact += int.from_bytes(self.digits[pos].translate(_hit_table(digit)), "little")
+        total = 0
+        for color, counts in enumerate(self.color_counts):
+            g_count = guess.count(color)
+            if g_count:
+                total += int.from_bytes(counts.translate(_cap_table(g_count)), "little")
+        return (total + self.code_len * exact).to_bytes(self.size, "little")
+
+
+# Bigger universes (e.g. 8 colors x 6 pegs = 262144) get no decision tree and are
+# checked per secret instead; their feedback rows are not kept either
+_TREE_MAX_CODES = 10_000
+
+# Every config enumerates all its codes into a FeedbackTable, so the universe is
+# capped: 8 colors x 6 pegs fits, 10 colors x 8 pegs (10^8 codes) would not
+_MAX_CODES = 300_000
+
+
+class FeedbackTable:
+    """
+    All codes of one config plus the feedback of every (guess, secret) pair,
+    one `bytes` row per guess (row[s_idx] = encoded feedback).
+
+    Rows are computed on first use (see _CodeColumns). Up to _TREE_MAX_CODES
+    codes they are kept with the table (at most 100 MB for the dense matrix);
+    above that every call recomputes its row, since per-secret solving touches
+    new guesses on every request and the rows would pile up.
+    """
+
+    def __init__(self, cfg: MastermindConfig) -> None:
+        self.cfg = cfg
+        self.codes: List[Code] = _all_codes(cfg)
+        self.index: Dict[Code, int] = {code: i for i, code in enumerate(self.codes)}
+        self.size = len(self.codes)
+        self.solved = cfg.code_len * (cfg.code_len + 1)
+        self.num_feedbacks = self.solved + 1
+        # every feedback value that can occur ((L-1, 1) cannot)
+        self.feedback_values = tuple(
+            _encode_feedback((exact, color_only), cfg.code_len)
+            for exact in range(cfg.code_len + 1)
+            for color_only in range(cfg.code_len + 1 - exact)
+            if (exact, color_only) != (cfg.code_len - 1, 1)
+        )
+
+        self._columns = _CodeColumns(self.codes, cfg.code_len, cfg.num_colors)
+        self._keep_rows = self.size <= _TREE_MAX_CODES
+        self._rows: List[Optional[bytes]] = [None] * self.size if self._keep_rows else []
+        self._lock = threading.Lock()
+        # solver's second guess per (strategy, feedback to the opener), shared by all
+        # solves; (strategy, -1) holds a strategy's own opener
+        self.opening_replies: Dict[Tuple[str, int], int] = {}
+
+    def row(self, g_idx: int) -> bytes:
+        if not self._keep_rows:
+            return self._columns.feedback_row(self.codes[g_idx])
+        row = self._rows[g_idx]
+        if row is None:
+            row = self._columns.feedback_row(self.codes[g_idx])
+            self._rows[g_idx] = row
+        return row
+
+    def row_for(self, guess: Code) -> bytes:
+        """Feedback row of any guess, including ones outside the universe (repeats in a no-repeat game)."""
+        g_idx = self.index.get(guess)
+        return self.row(g_idx) if g_idx is not None else self._columns.feedback_row(guess)
+
+    def build_all(self) -> None:
+        """Fill every row (the dense size x size matrix)."""
+        with self._lock:
+            for g_idx in range(self.size):
+                self.row(g_idx)
+
+    def feedback(self, g_idx: int, s_idx: int) -> Feedback:
+        return _decode_feedback(self.row(g_idx)[s_idx], self.cfg.code_len)
+
+
+# a few configs at a time; clients can ask for any number of distinct ones
+@lru_cache(maxsize=8)
+def _feedback_table_for(code_len: int, num_colors: int, allow_repeats: bool) -> FeedbackTable:
+    return FeedbackTable(MastermindConfig(code_len, num_colors, allow_repeats))
+
+
+def _validate_config(cfg: MastermindConfig) -> None:
+    if cfg.code_len <= 0:
+        raise ValueError("code_len must be positive.")
+    if cfg.code_len > 15:
+        raise ValueError("code_len must be <= 15.")
+    if cfg.num_colors <= 1:
+        raise ValueError("num_colors must be >= 2.")
+    if cfg.num_colors > 255:
+        # colors are stored as bytes (see _CodeColumns)
+        raise ValueError("num_colors must be <= 255.")
+    if not cfg.allow_repeats and cfg.num_colors < cfg.code_len:
+        raise ValueError("num_colors must be >= code_len when repeats are disallowed.")
+    if _num_codes(cfg) > _MAX_CODES:
+        raise ValueError(f"Configs are limited to {_MAX_CODES} possible codes.")
+
+
+def _num_codes(cfg: MastermindConfig) -> int:
+    if cfg.allow_repeats:
+        return cfg.num_colors ** cfg.code_len
+    return math.perm(cfg.num_colors, cfg.code_len)
+
+
+def get_feedback_table(cfg: MastermindConfig) -> FeedbackTable:
+    """Process-wide FeedbackTable for (code_len, num_colors, allow_repeats)."""
+    _validate_config(cfg)
+    return _feedback_table_for(cfg.code_len, cfg.num_colors, cfg.allow_repeats)
+
+
+# ----------------------------
+# Solver used ONLY for "solvable within attempts" validation
+# ----------------------------
+def _first_guess_index(table: FeedbackTable) -> int:
     # A decent fixed first guess improves consistency (classic for 4 pegs is 0011-ish)
     # If fewer than 2 colors, config validation should have blocked it.
+    cfg = table.cfg
     if cfg.num_colors >= 2 and cfg.code_len >= 4:
         first = tuple([0, 0, 1, 1] + [0] * (cfg.code_len - 4))
     else:
         first = tuple([0] * cfg.code_len)
+    # 0011 repeats colors, so it is not a legal guess when repeats are off
+    return table.index.get(first, 0)
 
-    guesses = 0
-    guess = first
 
-    # Precompute feedback table for speed: fb[(g_idx, s_idx)] -> Feedback
-    # For small spaces this is fine.
-    fb_table: Dict[Tuple[int, int], Feedback] = {}
-    idx_of = {code: i for i, code in enumerate(universe)}
-    s_idx = idx_of[secret]
+def _minimax_guess(table: FeedbackTable, candidates: List[int]) -> int:
+    """
+    Pick the guess (from the whole universe) that minimizes the worst-case
+    number of remaining candidates. Ties prefer a guess that is itself a candidate.
+    """
+    # If only one candidate remains, pick it.
+    if len(candidates) == 1:
+        return candidates[0]
+
+    cand_set = set(candidates)
+    counts = [0] * table.num_feedbacks
+    best_guess: Optional[int] = None
+    best_worst = 10**18
+    best_is_candidate = False
+
+    for g in range(table.size):
+        row = table.row(g)
+        is_candidate = g in cand_set
+        # a tie only helps a candidate guess replacing a non-candidate best
+        limit = best_worst + 1 if is_candidate and not best_is_candidate else best_worst
+        worst = 0
+        touched = []
+
+        for c in candidates:
+            f = row[c]
+            k = counts[f] + 1
+            counts[f] = k
+            if k == 1:
+                touched.append(f)
+            if k > worst:
+                worst = k
+                if worst >= limit:
+                    break  # prune
+        for f in touched:
+            counts[f] = 0
+
+        if worst < best_worst:
+            best_worst = worst
+            best_guess = g
+            best_is_candidate = is_candidate
+        elif worst == best_worst and is_candidate and not best_is_candidate:
+            # Tie-break: prefer a guess that is actually a remaining candidate
+            # (only reached after a full count, see `limit`)
+            best_guess = g
+            best_is_candidate = True
+
+    # Safety (should never happen)
+    return best_guess if best_guess is not None else candidates[0]
+
+
+# Solving strategies (all deterministic, so each gives a fixed step count per secret):
+#   minimax   - Knuth: minimize the worst-case number of remaining candidates
+#   max_parts - maximize the number of distinct feedbacks (partitions)
+#   entropy   - maximize the expected information of the feedback
+#   greedy    - always guess the first remaining candidate
+STRATEGIES = ("minimax", "max_parts", "entropy", "greedy")
+
+# Above this many codes a full (universe x candidates) scan is too slow in
+# Python, so guesses come from the candidate set instead of the universe.
+_FULL_SEARCH_MAX_CODES = 1296  # 6 colors x 4 pegs
+_GUESS_POOL_MAX = 400
+
+
+def _partition_score(strategy: str, sizes: List[int]) -> float:
+    """Lower is better."""
+    if strategy == "minimax":
+        return max(sizes)
+    if strategy == "max_parts":
+        return -(len(sizes) - sizes.count(0))
+    # entropy: the candidate total is fixed, so maximizing entropy means minimizing sum(n log n)
+    return sum(n * math.log(n) for n in sizes if n > 1)
+
+
+def _scored_guess(table: FeedbackTable, candidates: List[int], strategy: str) -> int:
+    """
+    Best guess under `strategy`. The feedback of a guess against every candidate
+    is one byte row and the partition sizes are bytes.count calls, so no per-pair
+    Python work is done. Guesses come from the whole universe for small configs
+    (ties prefer a remaining candidate, then the lowest index) and from the
+    candidates (evenly strided down to _GUESS_POOL_MAX) above _FULL_SEARCH_MAX_CODES.
+    """
+    if len(candidates) <= 2:
+        return candidates[0]
+
+    cfg = table.cfg
+    codes = table.codes
+    columns = _CodeColumns([codes[c] for c in candidates], cfg.code_len, cfg.num_colors)
+    values = table.feedback_values
+    if table.size <= _FULL_SEARCH_MAX_CODES:
+        pool: Iterable[int] = range(table.size)
+        cand_set = set(candidates)
+    else:
+        pool = candidates[::-(-len(candidates) // _GUESS_POOL_MAX)]
+        cand_set = None  # every pooled guess is a candidate
+
+    best_guess = candidates[0]
+    best_key = (math.inf, True)
+    for g in pool:
+        row = columns.feedback_row(codes[g])
+        key = (_partition_score(strategy, list(map(row.count, values))), cand_set is not None and g not in cand_set)
+        if key < best_key:
+            best_key = key
+            best_guess = g
+    return best_guess
+
 
-    def fb_idx(g_idx: int, s_idx_: int) -> Feedback:
-        key = (g_idx, s_idx_)
-        if key not in fb_table:
-            fb_table[key] = _feedback(universe[g_idx], universe[s_idx_], cfg.num_colors)
-        return fb_table[key]
+def _choose_guess(table: FeedbackTable, candidates: List[int], strategy: str) -> int:
+    if strategy == "greedy":
+        return candidates[0]
+    if strategy == "minimax" and table.size <= _FULL_SEARCH_MAX_CODES:
+        return _minimax_guess(table, candidates)
+    return _scored_guess(table, candidates, strategy)
+
+
+def _check_strategy(strategy: str) -> None:
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {', '.join(STRATEGIES)}.")
+
+
+def _opening_guess(table: FeedbackTable, strategy: str) -> int:
+    # minimax keeps the classic fixed opener; the others pick their own (memoized)
+    if strategy == "minimax":
+        return _first_guess_index(table)
+    key = (strategy, -1)
+    if key not in table.opening_replies:
+        table.opening_replies[key] = _choose_guess(table, list(range(table.size)), strategy)
+    return table.opening_replies[key]
+
+
+def _solve_steps_needed(cfg: MastermindConfig, secret: Code, strategy: str = "minimax") -> int:
+    """
+    Returns how many guesses a deterministic solver needs to find `secret`.
+
+    Strategy (minimax, the default):
+      - Maintain candidate set S of possible secrets.
+      - Pick a guess that minimizes the *worst-case* size of S after feedback (minimax).
+      - Guess from the universe of all codes (works well for small spaces like 4^4=256);
+        above _FULL_SEARCH_MAX_CODES guesses come from the candidates instead.
+    See STRATEGIES for the others. All feedback comes from the shared
+    FeedbackTable, so filtering and bucket counting are byte lookups.
+    """
+    _check_strategy(strategy)
+    table = get_feedback_table(cfg)
+    candidates = list(range(table.size))  # indices of possible secrets remaining
+    g_idx = _opening_guess(table, strategy)
+    s_idx = table.index[secret]
+    guesses = 0
 
     while True:
         guesses += 1
-        g_idx = idx_of[guess]
-        fb = fb_idx(g_idx, s_idx)
+        row = table.row(g_idx)
+        fb = row[s_idx]
 
         # Found it
-        if fb[0] == cfg.code_len:
+        if fb == table.solved:
             return guesses
 
-        # Filter candidates consistent with this feedback
-        new_candidates: List[Code] = []
-        for cand in candidates:
-            if _feedback(guess, cand, cfg.num_colors) == fb:
-                new_candidates.append(cand)
-        candidates = new_candidates
-
-        # Choose next guess by minimax (minimize worst-case remaining candidates)
-        # If only one candidate remains, pick it.
-        if len(candidates) == 1:
-            guess = candidates[0]
-            continue
-
-        # Build a quick index list for candidates to avoid repeated tuple hashing.
-        cand_indices = [idx_of[c] for c in candidates]
-
-        best_guess: Optional[Code] = None
-        best_worst = 10**18
-        best_is_candidate = False
-
-        for g in universe:
-            g_i = idx_of[g]
-            buckets: Dict[Feedback, int] = {}
-            worst = 0
-
-            for c_i in cand_indices:
-                f = fb_idx(g_i, c_i)
-                buckets[f] = buckets.get(f, 0) + 1
-                if buckets[f] > worst:
-                    worst = buckets[f]
-                    if worst >= best_worst:
-                        break  # prune
-
-            if worst < best_worst:
-                best_worst = worst
-                best_guess = g
-                best_is_candidate = (g in candidates)
-            elif worst == best_worst and best_guess is not None:
-                # Tie-break: prefer a guess that is actually a remaining candidate
-                g_is_candidate = (g in candidates)
-                if g_is_candidate and not best_is_candidate:
-                    best_guess = g
-                    best_is_candidate = True
-
-        # Safety (should never happen)
-        guess = best_guess if best_guess is not None else candidates[0]
+        # Filter candidates consistent with this feedback, then choose the next guess
+        candidates = [c for c in candidates if row[c] == fb]
+        if guesses == 1:
+            key = (strategy, fb)
+            g_idx = table.opening_replies.get(key, -1)
+            if g_idx < 0:
+                g_idx = table.opening_replies[key] = _choose_guess(table, candidates, strategy)
+        else:
+            g_idx = _choose_guess(table, candidates, strategy)
+
+
+# ----------------------------
+# Decision tree: steps for every secret
+# ----------------------------
+# The solver only looks at the candidate set, so the guesses it makes form a
+# fixed tree per config and strategy. Walking that tree once gives the step
+# count of every secret; the result is cached in memory and on disk.
+MASTERMIND_CACHE_DIR = os.environ.get(
+    "MASTERMIND_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "mastermind"),
+)
+_STEPS_CACHE_VERSION = 1
+
+
+def _build_steps_by_secret(cfg: MastermindConfig, strategy: str) -> List[int]:
+    table = get_feedback_table(cfg)
+    steps = [0] * table.size
+    # stack of (candidates, guess to play, guess number)
+    stack = [(list(range(table.size)), _opening_guess(table, strategy), 1)]
+    while stack:
+        candidates, g_idx, depth = stack.pop()
+        row = table.row(g_idx)
+        buckets: Dict[int, List[int]] = {}
+        for c in candidates:
+            buckets.setdefault(row[c], []).append(c)
+        for fb, bucket in buckets.items():
+            if fb == table.solved:
+                steps[bucket[0]] = depth
+            else:
+                stack.append((bucket, _choose_guess(table, bucket, strategy), depth + 1))
+    return steps
+
+
+def _steps_cache_path(cfg: MastermindConfig, strategy: str) -> str:
+    name = f"steps_{strategy}_{cfg.code_len}x{cfg.num_colors}_{'rep' if cfg.allow_repeats else 'norep'}.json"
+    return os.path.join(MASTERMIND_CACHE_DIR, name)
+
+
+def _load_steps(cfg: MastermindConfig, strategy: str, size: int) -> Optional[List[int]]:
+    try:
+        with open(_steps_cache_path(cfg, strategy)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    steps = data.get("steps")
+    if data.get("version") != _STEPS_CACHE_VERSION or not isinstance(steps, list) or len(steps) != size:
+        return None
+    return steps
+
+
+def _save_steps(cfg: MastermindConfig, strategy: str, steps: List[int]) -> None:
+    path = _steps_cache_path(cfg, strategy)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump({"version": _STEPS_CACHE_VERSION, "steps": steps}, f)
+        os.replace(tmp, path)  # atomic, so concurrent workers never see a partial file
+    except OSError:
+        pass  # read-only deployments just recompute per process
+
+
+@lru_cache(maxsize=None)
+def _steps_by_secret_for(code_len: int, num_colors: int, allow_repeats: bool, strategy: str) -> Tuple[int, ...]:
+    cfg = MastermindConfig(code_len, num_colors, allow_repeats)
+    size = len(get_feedback_table(cfg).codes)
+    steps = _load_steps(cfg, strategy, size)
+    if steps is None:
+        steps = _build_steps_by_secret(cfg, strategy)
+        _save_steps(cfg, strategy, steps)
+    return tuple(steps)
+
+
+def solver_steps_by_secret(cfg: MastermindConfig, strategy: str = "minimax") -> Tuple[int, ...]:
+    """Guesses the built-in solver needs for each code, indexed like the config's FeedbackTable."""
+    _check_strategy(strategy)
+    _validate_config(cfg)
+    if _num_codes(cfg) > _TREE_MAX_CODES:
+        raise ValueError(f"Step tables are only built for configs with at most {_TREE_MAX_CODES} codes.")
+    return _steps_by_secret_for(cfg.code_len, cfg.num_colors, cfg.allow_repeats, strategy)
+
+
+@dataclass(frozen=True)
+class MastermindStrategyStats:
+    config: MastermindConfig
+    strategy: str
+    average: float                            # mean guesses over all secrets
+    worst: int
+    distribution: Tuple[Tuple[int, int], ...]  # (guesses, number of secrets), ascending
+
+
+@lru_cache(maxsize=None)
+def strategy_stats(cfg: MastermindConfig, strategy: str = "minimax") -> MastermindStrategyStats:
+    """Summary of a strategy's step counts over every secret of the config (cached)."""
+    _validate_config(cfg)
+    steps = solver_steps_by_secret(cfg, strategy)
+    counts: Dict[int, int] = {}
+    for k in steps:
+        counts[k] = counts.get(k, 0) + 1
+    return MastermindStrategyStats(
+        config=cfg,
+        strategy=strategy,
+        average=sum(steps) / len(steps),
+        worst=max(steps),
+        distribution=tuple(sorted(counts.items())),
+    )
+
+
+def _is_trivial(cfg: MastermindConfig, code: Code) -> bool:
+    # Avoid all same color
+    uniq = len(set(code))
+    if uniq == 1:
+        return True
+
+    # If repeats allowed, optionally avoid extreme repetition like 3-of-a-kind in length 4
+    if cfg.allow_repeats:
+        freq: Dict[int, int] = {}
+        for x in code:
+            freq[x] = freq.get(x, 0) + 1
+        if max(freq.values()) >= cfg.code_len - 1:  # e.g., 3 same in a 4 code
+            return True
+
+    return False
+
+
+@lru_cache(maxsize=256)
+def _eligible_secrets(
+    cfg: MastermindConfig, strategy: str, max_attempts: int, avoid_trivial: bool
+) -> Tuple[int, ...]:
+    """Indices of codes solvable within max_attempts (and non-trivial if requested)."""
+    table = get_feedback_table(cfg)
+    steps = solver_steps_by_secret(cfg, strategy)
+    return tuple(
+        i
+        for i, code in enumerate(table.codes)
+        if steps[i] <= max_attempts and not (avoid_trivial and _is_trivial(cfg, code))
+    )
+
+
+# ----------------------------
+# Game sessions
+# ----------------------------
+@lru_cache(maxsize=None)
+def _bit_char_table(value: int) -> bytes:
+    # maps a feedback byte to ASCII '1' if it equals `value`, else '0'
+    return bytes(49 if v == value else 48 for v in range(256))
+
+
+class MastermindSession:
+    """
+    One game against a secret, tracking the codes still consistent with every
+    feedback so far.
+
+    The candidates are a bitset over the config's FeedbackTable (a Python int,
+    bit i = code i). A guess narrows it with the guess's feedback row: one
+    bytes.translate to '0'/'1' characters and an int parse give the mask of
+    codes with the same feedback, so no per-code scoring is done.
+    """
+
+    def __init__(self, secret: MastermindSecret, strategy: str = "minimax") -> None:
+        _check_strategy(strategy)
+        _validate_config(secret.config)
+        self.secret = secret
+        self.strategy = strategy
+        self.table = get_feedback_table(secret.config)
+        self.candidates = (1 << self.table.size) - 1
+        self.guesses: List[Tuple[Code, Feedback]] = []
+        self._secret_idx = self.table.index[secret.code]
+
+    @property
+    def attempts_used(self) -> int:
+        return len(self.guesses)
+
+    @property
+    def solved(self) -> bool:
+        return bool(self.guesses) and self.guesses[-1][0] == self.secret.code
+
+    @property
+    def game_over(self) -> bool:
+        return self.solved or self.attempts_used >= self.secret.max_attempts
+
+    @property
+    def candidates_remaining(self) -> int:
+        return self.candidates.bit_count()
+
+    def submit_guess(self, guess: Iterable[int]) -> Feedback:
+        cfg = self.secret.config
+        code = tuple(int(x) for x in guess)
+        if len(code) != cfg.code_len:
+            raise ValueError(f"guess must have {cfg.code_len} pegs.")
+        if any(x < 0 or x >= cfg.num_colors for x in code):
+            raise ValueError(f"guess colors must be in 0..{cfg.num_colors - 1}.")
+        if self.game_over:
+            raise ValueError("game is already over.")
+
+        row = self.table.row_for(code)
+        value = row[self._secret_idx]
+        mask = int(row.translate(_bit_char_table(value))[::-1], 2)
+        self.candidates &= mask
+
+        fb = _decode_feedback(value, cfg.code_len)
+        self.guesses.append((code, fb))
+        return fb
+
+    def candidate_indices(self) -> List[int]:
+        bits = bin(self.candidates)[:1:-1]  # bit 0 first
+        return [i for i, b in enumerate(bits) if b == "1"]
+
+    def hint(self) -> Code:
+        """The next guess the session's strategy would play."""
+        if not self.guesses:
+            return self.table.codes[_opening_guess(self.table, self.strategy)]
+        candidates = self.candidate_indices()
+        return self.table.codes[_choose_guess(self.table, candidates, self.strategy)]
 
 
 # ============================
@@ -203,64 +673,60 @@ def generate_mastermind_secret(
     max_attempts: int = 10,
     enforce_solvable_within_attempts: bool = True,
     max_tries: int = 50_000,
+    strategy: str = "minimax",
 ) -> MastermindSecret:
     """
     Generate a secret code for a Mastermind/Tower puzzle, with an optional guarantee
     that it is solvable (by our deterministic solver) within `max_attempts`.
 
     Returns:
-      MastermindSecret(config=..., code=(...), max_attempts=max_attempts)
+      MastermindSecret(config=..., code=(...), max_attempts=max_attempts, solver_steps=...)
 
     Notes:
       - Colors are integers 0..num_colors-1 (map these to UI colors in Swift).
       - "Solvable within attempts" here means: our built-in solver can deduce the
         secret within max_attempts guesses (not just "possible in theory").
+      - With enforce_solvable_within_attempts the secret is drawn uniformly from the
+        qualifying codes of the config's cached decision tree, so no solving happens
+        per request and max_tries is not used. Configs above _TREE_MAX_CODES codes
+        sample and solve per secret instead (up to max_tries).
+      - `strategy` picks the solver (see STRATEGIES) that max_attempts applies to.
     """
-    if config.code_len <= 0:
-        raise ValueError("code_len must be positive.")
-    if config.num_colors <= 1:
-        raise ValueError("num_colors must be >= 2.")
+    _validate_config(config)
     if max_attempts <= 0:
         raise ValueError("max_attempts must be positive.")
-    if not config.allow_repeats and config.num_colors < config.code_len:
-        raise ValueError("num_colors must be >= code_len when repeats are disallowed.")
+    _check_strategy(strategy)
 
     rng = random.Random(seed)
 
-    def is_trivial(code: Code) -> bool:
-        if not avoid_trivial:
-            return False
-
-        # Avoid all same color
-        uniq = len(set(code))
-        if uniq == 1:
-            return True
-
-        # If repeats allowed, optionally avoid extreme repetition like 3-of-a-kind in length 4
-        if config.allow_repeats:
-            freq: Dict[int, int] = {}
-            for x in code:
-                freq[x] = freq.get(x, 0) + 1
-            if max(freq.values()) >= config.code_len - 1:  # e.g., 3 same in a 4 code
-                return True
-
-        return False
-
-    for _ in range(max_tries):
-        if config.allow_repeats:
-            code = tuple(rng.randrange(config.num_colors) for _ in range(config.code_len))
-        else:
-            code = tuple(rng.sample(range(config.num_colors), k=config.code_len))
-
-        if is_trivial(code):
-            continue
+    if enforce_solvable_within_attempts and _num_codes(config) <= _TREE_MAX_CODES:
+        # Uniform over the qualifying secrets, read off the cached decision tree
+        pool = _eligible_secrets(config, strategy, max_attempts, avoid_trivial)
+        if pool:
+            idx = rng.choice(pool)
+            return MastermindSecret(
+                config=config,
+                code=get_feedback_table(config).codes[idx],
+                max_attempts=max_attempts,
+                solver_steps=solver_steps_by_secret(config, strategy)[idx],
+            )
+    else:
+        for _ in range(max_tries):
+            if config.allow_repeats:
+                code = tuple(rng.randrange(config.num_colors) for _ in range(config.code_len))
+            else:
+                code = tuple(rng.sample(range(config.num_colors), k=config.code_len))
 
-        if enforce_solvable_within_attempts:
-            steps = _solve_steps_needed(config, code)
-            if steps > max_attempts:
+            if avoid_trivial and _is_trivial(config, code):
                 continue
 
-        return MastermindSecret(config=config, code=code, max_attempts=max_attempts)
+            steps: Optional[int] = None
+            if enforce_solvable_within_attempts:
+                steps = _solve_steps_needed(config, code, strategy)
+                if steps > max_attempts:
+                    continue
+
+            return MastermindSecret(config=config, code=code, max_attempts=max_attempts, solver_steps=steps)
 
     raise RuntimeError(
         "Failed to generate a secret solvable within the requested attempts; "
@@ -278,4 +744,4 @@ if __name__ == "__main__":
         max_attempts=6,
         enforce_solvable_within_attempts=True,
     )
-    print(secret.code, "attempts:", secret.max_attempts)
+    print(secret.code, "attempts:", secret.max_attempts, "solver steps:", secret.solver_steps)
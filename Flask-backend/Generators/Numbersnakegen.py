@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict
+from functools import lru_cache
+from typing import List, Tuple, Optional, Dict, Set
 import random
 
 Cell = Tuple[int, int]  # (r, c)
@@ -26,6 +27,19 @@ class SnapPuzzle:
 # ----------------------------
 DIRS: List[Cell] = [(1,0), (-1,0), (0,1), (0,-1)]
 
+# Largest boards (rows * cols) the exhaustive uniqueness checks are run on. The
+# search grows steeply: 8x8 takes seconds, 9x9 tens of seconds; without fixed
+# endpoints every cell is a possible start, so 8x8 is already that slow.
+MAX_UNIQUE_CELLS = 64
+MAX_UNIQUE_CELLS_FREE_ENDS = 49
+
+# ensure_unique gives up early instead of running max_tries full passes: a
+# path whose minimal clue set is more than UNIQUE_CLUE_SLACK above num_clues
+# means num_clues is below what the board needs (feasible requests land within
+# 2), and at most MAX_UNIQUE_TRIES paths are tried.
+UNIQUE_CLUE_SLACK = 2
+MAX_UNIQUE_TRIES = 10
+
 def _in_bounds(r: int, c: int, R: int, C: int) -> bool:
     return 0 <= r < R and 0 <= c < C
 
@@ -83,6 +97,286 @@ def _hamiltonian_path_warnsdorff(
 
     return None
 
+# ----------------------------
+# Solver: count paths (uniqueness check)
+# ----------------------------
+# Cells are bits r*C + c of an int; every pruning test below is a handful of
+# shifts and ANDs over the whole board at once.
+@lru_cache(maxsize=None)
+def _board_masks(R: int, C: int) -> Tuple[int, int, int, int, Tuple[Tuple[int, ...], ...]]:
+    """(full, not_first_col, not_last_col, dark squares, neighbor indices per cell)."""
+    full = (1 << (R * C)) - 1
+    first_col = sum(1 << (r * C) for r in range(R))
+    last_col = first_col << (C - 1)
+    dark = sum(1 << (r * C + c) for r in range(R) for c in range(C) if (r + c) % 2)
+    nbrs = tuple(
+        tuple(rr * C + cc for rr, cc in _neighbors((r, c), R, C))
+        for r in range(R) for c in range(C)
+    )
+    return full, full & ~first_col, full & ~last_col, dark, nbrs
+
+
+def _shifts(mask: int, C: int, not_first: int, not_last: int, full: int) -> Tuple[int, int, int, int]:
+    """Cells whose right / left / lower / upper neighbor is in mask."""
+    return (mask >> 1) & not_last, (mask << 1) & not_first, mask >> C, (mask << C) & full
+
+
+def _flood(seed: int, allowed: int, C: int, not_first: int, not_last: int, full: int) -> int:
+    """All cells of `allowed` connected to seed (seed itself included)."""
+    reach = seed
+    while True:
+        grown = (reach | (reach >> 1) & not_last | (reach << 1) & not_first | reach >> C | reach << C) & allowed
+        if grown == reach:
+            return reach
+        reach = grown
+
+
+def count_snap_solutions(
+    rows: int,
+    cols: int,
+    clues: List[SnapClue],
+    *,
+    endpoints_fixed: bool = True,
+    limit: int = 2,
+    found: Optional[List[List[Cell]]] = None,
+    known: Optional[List[Cell]] = None,
+    nogoods: Optional[Dict[Tuple[int, ...], Set[Tuple[int, int]]]] = None,
+) -> int:
+    """
+    Counts paths through every cell that visit clues 1..K in order, up to
+    'limit' (early exit). Used for uniqueness checking. With endpoints_fixed the
+    path must start on clue 1 and end on clue K (keep_endpoints_labeled);
+    otherwise it may start and end anywhere. Paths seen are appended to `found`
+    if provided.
+
+    Depth-first over path extensions (fewest onward moves first), pruned at
+    every step by:
+      - parity: the grid is bipartite, so the unvisited cells must split
+        evenly between the colors, starting with the color after the head's;
+      - connectivity: every unvisited cell must be reachable from the head;
+      - clue reachability: the next clue must be reachable from the head
+        without passing a later clue (segment lengths between clues are free,
+        so this is the only distance bound that holds);
+      - dead ends: an unvisited cell with fewer than two open neighbors can
+        only be the path's end, so there may be at most one (and it must be
+        clue K when the end is fixed).
+    States (head, unvisited cells) with no completion are remembered, since
+    different orders often reach the same state. Whether a state can be
+    completed depends only on the clues still ahead of it, so the nogoods are
+    filed under those clues' cells; pass the same `nogoods` dict to calls on
+    the same board and endpoints_fixed (e.g. while adding or removing clues)
+    and every call reuses what the others proved about the shared suffixes.
+    `known` (a solution path, e.g. the generator's) is tried first at every
+    step, so it is found without backtracking and only the search for a
+    second path remains.
+    """
+    R, C = rows, cols
+    full, not_first, not_last, dark, nbrs = _board_masks(R, C)
+    K = len(clues)
+    clue_bit = [0] * (K + 2)
+    clue_at = [0] * (R * C)
+    for clue in clues:
+        i = clue.r * C + clue.c
+        clue_at[i] = clue.value
+        clue_bit[clue.value] = 1 << i
+    if sorted(clue_at[i] for i in range(R * C) if clue_at[i]) != list(range(1, K + 1)):
+        raise ValueError("clues must be numbered 1..K on distinct cells.")
+    # later[k]: clues after k, which the path may not touch before reaching k
+    later = [0] * (K + 2)
+    for k in range(K - 1, 0, -1):
+        later[k] = later[k + 1] | clue_bit[k + 1]
+    last_bit = clue_bit[K]
+    path: List[int] = []
+    if nogoods is None:
+        nogoods = {}
+    # dead[k - 1]: nogoods for states whose next clue is k, filed under the cells of k..K
+    cells = [b.bit_length() - 1 for b in clue_bit[1:K + 1]]
+    dead = [nogoods.setdefault(tuple(cells[k - 1:]), set()) for k in range(1, K + 2)]
+    prefer = [-1] * (R * C)
+    if known is not None:
+        for (r1, c1), (r2, c2) in zip(known, known[1:]):
+            prefer[r1 * C + c1] = r2 * C + c2
+
+    def feasible(head: int, unvisited: int, k: int) -> bool:
+        n = bin(unvisited).count("1")
+        if not n:
+            return True
+        hbit = 1 << head
+        # parity
+        other = dark if not hbit & dark else full & ~dark
+        if bin(unvisited & other).count("1") != (n + 1) // 2:
+            return False
+        # connectivity
+        if _flood(hbit, unvisited | hbit, C, not_first, not_last, full) & unvisited != unvisited:
+            return False
+        # next clue, without passing a later one
+        if k <= K and not _flood(hbit, (unvisited | hbit) & ~later[k], C, not_first, not_last, full) & clue_bit[k]:
+            return False
+        # dead ends
+        a, b, c, d = _shifts(unvisited | hbit, C, not_first, not_last, full)
+        one = a | b | c | d
+        if unvisited & ~one:
+            return False
+        two = (a & b) | (c & (a | b)) | (d & (a | b | c))
+        ends = unvisited & ~two
+        if ends & (ends - 1):
+            return False
+        if endpoints_fixed and ends & ~last_bit:
+            return False
+        return True
+
+    def extend(head: int, unvisited: int, k: int, limit: int) -> int:
+        if not unvisited:
+            if k == K + 1:
+                if found is not None:
+                    found.append([divmod(i, C) for i in path])
+                return 1
+            return 0
+        if (head, unvisited) in dead[k - 1] or not feasible(head, unvisited, k):
+            return 0
+
+        moves = []
+        for nb in nbrs[head]:
+            if not unvisited >> nb & 1:
+                continue
+            v = clue_at[nb]
+            if v and v != k:
+                continue
+            if endpoints_fixed and v == K and unvisited != 1 << nb:
+                continue
+            moves.append(nb)
+        if len(moves) > 1:
+            moves.sort(key=lambda x: (x != prefer[head], sum(unvisited >> y & 1 for y in nbrs[x])))
+
+        total = 0
+        for nb in moves:
+            path.append(nb)
+            total += extend(nb, unvisited & ~(1 << nb), k + 1 if clue_at[nb] else k, limit - total)
+            path.pop()
+            if total >= limit:
+                break
+        if not total:
+            dead[k - 1].add((head, unvisited))
+        return total
+
+    first = clue_bit[1].bit_length() - 1
+    starts = [first] if endpoints_fixed else [i for i in range(R * C) if clue_at[i] in (0, 1)]
+    if known is not None and not endpoints_fixed:
+        s0 = known[0][0] * C + known[0][1]
+        starts.sort(key=lambda i: i != s0)
+    total = 0
+    for s in starts:
+        path.append(s)
+        k = 2 if clue_at[s] == 1 else 1
+        total += extend(s, full & ~(1 << s), k, limit - total)
+        path.pop()
+        if total >= limit:
+            break
+    return total
+
+
+def _clues_at(path: List[Cell], idxs: List[int]) -> List[SnapClue]:
+    """Clues 1..K on the given (sorted) path indices."""
+    return [SnapClue(value=i, r=path[j][0], c=path[j][1]) for i, j in enumerate(idxs, start=1)]
+
+
+def _is_unique(
+    rows: int,
+    cols: int,
+    path: List[Cell],
+    idxs: List[int],
+    fixed: bool,
+    nogoods: Optional[Dict[Tuple[int, ...], Set[Tuple[int, int]]]] = None,
+) -> bool:
+    return count_snap_solutions(
+        rows, cols, _clues_at(path, idxs), endpoints_fixed=fixed, known=path, nogoods=nogoods
+    ) == 1
+
+
+def _thin_clues(
+    rows: int,
+    cols: int,
+    path: List[Cell],
+    idxs: List[int],
+    floor: int,
+    fixed: bool,
+    rng: random.Random,
+    nogoods: Dict[Tuple[int, ...], Set[Tuple[int, int]]],
+) -> List[int]:
+    """
+    Remove clues in random order, keeping each removal only if `path` stays
+    the only solution, until no clue can go or `floor` are left. The endpoint
+    clues stay when fixed.
+    """
+    n = len(path)
+    movable = [j for j in idxs if not fixed or 0 < j < n - 1]
+    rng.shuffle(movable)
+    for j in movable:
+        if len(idxs) <= floor:
+            break
+        trial = [i for i in idxs if i != j]
+        if _is_unique(rows, cols, path, trial, fixed, nogoods):
+            idxs = trial
+    return idxs
+
+
+def _make_unique(
+    rows: int,
+    cols: int,
+    path: List[Cell],
+    idxs: List[int],
+    num_clues: int,
+    fixed: bool,
+    rng: random.Random,
+) -> List[int]:
+    """
+    Turn the clue indices into a set of num_clues that only `path` satisfies.
+
+    1) While another path fits, add clues on the first cell where the two
+       paths part ways and on the cell the other path takes there: `path`
+       visits them in one order and the other path in the opposite one, so
+       that path is ruled out for good.
+    2) Remove clues again in random order, keeping each removal only if the
+       solution stays unique, until num_clues are left.
+    Returns the thinned clues; more than num_clues if no further clue could go.
+    """
+    n = len(path)
+    at = {cell: i for i, cell in enumerate(path)}
+    idxs = sorted(idxs)
+    nogoods: Dict[Tuple[int, ...], Set[Tuple[int, int]]] = {}
+    while True:
+        found: List[List[Cell]] = []
+        if count_snap_solutions(
+            rows, cols, _clues_at(path, idxs), endpoints_fixed=fixed, found=found, known=path,
+            nogoods=nogoods,
+        ) == 1:
+            break
+        other = next(p for p in found if p != path)
+        t = next(i for i in range(n) if path[i] != other[i])
+        idxs = sorted(set(idxs) | {t, at[other[t]]})
+
+    return _thin_clues(rows, cols, path, idxs, num_clues, fixed, rng, nogoods)
+
+
+def _minimize_clues(
+    rows: int,
+    cols: int,
+    path: List[Cell],
+    floor: int,
+    fixed: bool,
+    rng: random.Random,
+) -> List[int]:
+    """
+    Start with a clue on every cell of `path` and thin them out while it stays
+    the only solution. The result is minimal (no single clue can be dropped),
+    not necessarily the smallest possible. All removal checks share one nogood
+    cache: a check that fails only differs from the next one in two clues, so
+    the states past both of them are already settled.
+    """
+    nogoods: Dict[Tuple[int, ...], Set[Tuple[int, int]]] = {}
+    return _thin_clues(rows, cols, path, list(range(len(path))), floor, fixed, rng, nogoods)
+
+
 # ----------------------------
 # Public generator
 # ----------------------------
@@ -94,6 +388,8 @@ def generate_snap(
     seed: Optional[int] = None,
     keep_endpoints_labeled: bool = True,
     max_tries: int = 2000,
+    ensure_unique: bool = True,
+    minimize_clues: bool = False,
 ) -> SnapPuzzle:
     """
     Generate a Snap-like puzzle:
@@ -103,6 +399,18 @@ def generate_snap(
     Parameters:
       num_clues: K (>=2). In your screenshots it's like 1..6-ish.
       keep_endpoints_labeled: if True, forces clue 1 = path start and clue K = path end.
+      ensure_unique: only return puzzles whose clues allow exactly one path
+          (see _make_unique). Boards need roughly 6 clues at 5x5, 8 at 6x6 and
+          10-11 at 7x7 (a few more without fixed endpoints). Raises
+          RuntimeError early when num_clues is too low for the board (see
+          UNIQUE_CLUE_SLACK and MAX_UNIQUE_TRIES) rather than spending
+          max_tries. Limited to MAX_UNIQUE_CELLS cells
+          (MAX_UNIQUE_CELLS_FREE_ENDS without fixed endpoints).
+      minimize_clues: start from a clue on every cell and remove clues while
+          the path stays unique, down to a minimal set (num_clues is then only
+          a lower bound). Gives the sparsest puzzles for the path: about 6
+          clues on 5x5 and 11 on 7x7 with fixed endpoints. Same board limits
+          as ensure_unique.
     """
     if rows <= 0 or cols <= 0:
         raise ValueError("rows/cols must be positive.")
@@ -110,8 +418,20 @@ def generate_snap(
         raise ValueError("num_clues must be >= 2.")
     if num_clues > rows * cols:
         raise ValueError("num_clues cannot exceed number of cells.")
+    if ensure_unique or minimize_clues:
+        mode = "minimize_clues" if minimize_clues else "ensure_unique"
+        if keep_endpoints_labeled:
+            max_cells, ends = MAX_UNIQUE_CELLS, ""
+        else:
+            max_cells, ends = MAX_UNIQUE_CELLS_FREE_ENDS, " without labeled endpoints"
+        if rows * cols > max_cells:
+            raise ValueError(
+                f"{mode} supports boards of at most {max_cells} cells{ends}; "
+                f"set {mode} to false for larger boards."
+            )
 
     rng = random.Random(seed)
+    unique_misses = 0
 
     for _ in range(max_tries):
         path = _hamiltonian_path_warnsdorff(rows, cols, rng, max_restarts=200)
@@ -120,6 +440,10 @@ def generate_snap(
 
         N = rows * cols
 
+        if minimize_clues:
+            idxs = _minimize_clues(rows, cols, path, num_clues, keep_endpoints_labeled, rng)
+            return SnapPuzzle(rows=rows, cols=cols, clues=_clues_at(path, idxs), solution_path=path)
+
         # Choose K indices along the path in increasing order.
         if keep_endpoints_labeled:
             # fixed endpoints
@@ -131,12 +455,20 @@ def generate_snap(
         else:
             idxs = sorted(rng.sample(range(N), num_clues))
 
-        clues: List[SnapClue] = []
-        for i, idx in enumerate(idxs, start=1):
-            r, c = path[idx]
-            clues.append(SnapClue(value=i, r=r, c=c))
+        if ensure_unique:
+            idxs = _make_unique(rows, cols, path, idxs, num_clues, keep_endpoints_labeled, rng)
+            if len(idxs) > num_clues + UNIQUE_CLUE_SLACK:
+                raise RuntimeError(
+                    f"num_clues={num_clues} is too few for a unique {rows}x{cols} puzzle "
+                    f"(a minimal clue set needed {len(idxs)}); try more clues."
+                )
+            if len(idxs) != num_clues:
+                unique_misses += 1
+                if unique_misses >= MAX_UNIQUE_TRIES:
+                    break
+                continue
 
-        return SnapPuzzle(rows=rows, cols=cols, clues=clues, solution_path=path)
+        return SnapPuzzle(rows=rows, cols=cols, clues=_clues_at(path, idxs), solution_path=path)
 
     raise RuntimeError("Failed to generate Snap puzzle; try different seed/params.")
 
@@ -145,7 +477,7 @@ def generate_snap(
 # Quick demo
 # ----------------------------
 if __name__ == "__main__":
-    p = generate_snap(5, 5, num_clues=6, seed=7, keep_endpoints_labeled=False)
+    p = generate_snap(5, 5, num_clues=7, seed=7, keep_endpoints_labeled=False)
     print("Clues:")
     for clue in p.clues:
         print(clue)
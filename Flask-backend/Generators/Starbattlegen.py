@@ -1,7 +1,11 @@
 from __future__ import annotations
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import multiprocessing
+import os
 import random
+import threading
 
 # ----------------------------
 # Star Battle (1-star) generator
@@ -15,16 +19,18 @@ GridBool = List[List[bool]]
 
 
 @lru_cache(maxsize=None)
-def _precompute_neighbors4(n: int) -> List[List[List[Tuple[int, int]]]]:
-    neigh: List[List[List[Tuple[int, int]]]] = [[[] for _ in range(n)] for _ in range(n)]
-    for r in range(n):
-        for c in range(n):
-            lst = neigh[r][c]
-            if r > 0: lst.append((r - 1, c))
-            if r + 1 < n: lst.append((r + 1, c))
-            if c > 0: lst.append((r, c - 1))
-            if c + 1 < n: lst.append((r, c + 1))
-    return neigh
+def _precompute_neighbors4(rows: int, cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """4-neighbors of every flat cell id (r*cols + c)."""
+    neigh: List[Tuple[int, ...]] = []
+    for r in range(rows):
+        for c in range(cols):
+            lst = []
+            if r > 0: lst.append((r - 1) * cols + c)
+            if r + 1 < rows: lst.append((r + 1) * cols + c)
+            if c > 0: lst.append(r * cols + c - 1)
+            if c + 1 < cols: lst.append(r * cols + c + 1)
+            neigh.append(tuple(lst))
+    return tuple(neigh)
 
 @lru_cache(maxsize=None)
 def _row_order_middle_first(n: int) -> Tuple[int, ...]:
@@ -79,105 +85,197 @@ def _generate_star_solution(n: int, rng: random.Random) -> List[int]:
 
     return cols
 
-def _build_regions_from_stars(
-    n: int,
-    star_cols: List[int],
+class _Fenwick:
+    """Binary indexed tree over non-negative int weights with weighted sampling."""
+
+    __slots__ = ("n", "tree", "weights", "total", "top")
+
+    def __init__(self, weights: List[int]) -> None:
+        self.n = len(weights)
+        self.weights = list(weights)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        n = self.n
+        tree = [0] * (n + 1)
+        for i, w in enumerate(self.weights, 1):
+            tree[i] += w
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.tree = tree
+        self.total = sum(self.weights)
+        self.top = 1 << (n.bit_length() - 1) if n else 0
+
+    def set(self, idx: int, w: int) -> None:
+        delta = w - self.weights[idx]
+        if not delta:
+            return
+        self.weights[idx] = w
+        self.total += delta
+        i = idx + 1
+        tree = self.tree
+        while i <= self.n:
+            tree[i] += delta
+            i += i & -i
+
+    def sample(self, rng: random.Random) -> int:
+        """Index i chosen with probability weights[i] / total (total must be > 0)."""
+        x = rng.randrange(self.total)
+        pos = 0
+        step = self.top
+        tree = self.tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and tree[nxt] <= x:
+                pos = nxt
+                x -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+def _grow_regions(
+    rows: int,
+    cols: int,
+    seeds: List[List[int]],
     rng: random.Random,
-    neigh: List[List[List[Tuple[int, int]]]],
-) -> GridInt:
+) -> List[int]:
     """
-    Same logic as before, but frontier cells are encoded as ints (r*n + c)
-    instead of (r, c) tuples to reduce hashing/allocation overhead.
+    Grows one connected region per entry of `seeds` (each a list of flat cell ids
+    that must belong to that region) until every cell is claimed.
+
+    Returns a flat list region_of[cell]. Everything lives in flat arrays:
+      - frontier lists with lazy deletion plus a live count per region,
+      - a per-cell bitmask of which regions have the cell on their frontier,
+      - a Fenwick tree over the size-biased weights, so picking a region is
+        O(log k) and only the grown region's weight changes per step.
+    The weights match the old rule 1 + max(0, min_size + 3 - size); min_size is
+    tracked with per-size counts and only ever increases, so the full
+    reweighting it triggers happens at most (largest region size) times.
     """
-    regions: GridInt = [[-1] * n for _ in range(n)]
-    sizes = [0] * n
-
-    # frontier as (list, set) of INT cells to allow O(1) random pick + membership
-    f_list: List[List[int]] = [[] for _ in range(n)]
-    f_set: List[set] = [set() for _ in range(n)]
-
-    def enc(r: int, c: int) -> int:
-        return r * n + c
-
-    def frontier_add(rid: int, cell_id: int) -> None:
-        if cell_id not in f_set[rid]:
-            f_set[rid].add(cell_id)
-            f_list[rid].append(cell_id)
-
-    # seed each region at its star cell
-    for rid, c in enumerate(star_cols):
-        r = rid
-        regions[r][c] = rid
-        sizes[rid] = 1
-        for nr, nc in neigh[r][c]:
-            if regions[nr][nc] == -1:
-                frontier_add(rid, enc(nr, nc))
-
-    unassigned = n * n - n
-
-    # eligibility tracking (avoid O(n) list removes)
-    is_eligible = [bool(f_set[rid]) for rid in range(n)]
-    eligible_count = sum(is_eligible)
+    total = rows * cols
+    k = len(seeds)
+    neigh = _precompute_neighbors4(rows, cols)
+
+    region_of = [-1] * total
+    sizes = [0] * k
+    f_list: List[List[int]] = [[] for _ in range(k)]
+    f_live = [0] * k               # unclaimed cells currently on each frontier
+    on_front = [0] * total         # bitmask of regions whose frontier holds the cell
+
+    for rid, cells in enumerate(seeds):
+        for cell in cells:
+            if region_of[cell] != -1:
+                raise ValueError("Region seeds overlap.")
+            region_of[cell] = rid
+        sizes[rid] = len(cells)
+
+    def frontier_add(rid: int, cell: int) -> None:
+        bit = 1 << rid
+        if not on_front[cell] & bit:
+            on_front[cell] |= bit
+            f_list[rid].append(cell)
+            f_live[rid] += 1
+
+    for rid, cells in enumerate(seeds):
+        for cell in cells:
+            for nb in neigh[cell]:
+                if region_of[nb] == -1:
+                    frontier_add(rid, nb)
+
+    unassigned = total - sum(sizes)
+
+    # eligible regions (non-empty frontier) bucketed by size, for min_size tracking
+    size_count: dict = {}
+    for rid in range(k):
+        if f_live[rid]:
+            size_count[sizes[rid]] = size_count.get(sizes[rid], 0) + 1
+    min_size = min(size_count) if size_count else 0
+
+    def size_drop(size: int) -> None:
+        left = size_count[size] - 1
+        if left:
+            size_count[size] = left
+        else:
+            del size_count[size]
+
+    def weight(rid: int) -> int:
+        if not f_live[rid]:
+            return 0
+        return 1 + max(0, (min_size + 3) - sizes[rid])
+
+    tree = _Fenwick([weight(rid) for rid in range(k)])
 
     while unassigned > 0:
-        if eligible_count == 0:
+        if tree.total == 0:
             raise RuntimeError("Region growth got stuck; retry with a different seed.")
 
-        # build eligible list only for sampling (n is small)
-        eligible = [rid for rid in range(n) if is_eligible[rid]]
+        rid = tree.sample(rng)
 
-        # choose region to grow (bias toward smaller regions)
-        min_size = min(sizes[rid] for rid in eligible)
-        weights = [1 + max(0, (min_size + 3) - sizes[rid]) for rid in eligible]
-        rid = rng.choices(eligible, weights=weights, k=1)[0]
-
-        # pick random frontier cell using lazy deletion
+        # pick a random live frontier cell, dropping stale entries as we meet them
+        lst = f_list[rid]
         while True:
-            if not f_list[rid]:
-                # nothing left to try for this region; update eligibility from the set
-                if not f_set[rid] and is_eligible[rid]:
-                    is_eligible[rid] = False
-                    eligible_count -= 1
+            idx = rng.randrange(len(lst))
+            cell = lst[idx]
+            lst[idx] = lst[-1]
+            lst.pop()
+            if region_of[cell] == -1:
                 break
 
-            idx = rng.randrange(len(f_list[rid]))
-            cell_id = f_list[rid][idx]
-            # swap-remove from list
-            f_list[rid][idx] = f_list[rid][-1]
-            f_list[rid].pop()
-
-            # consume only if still present in the frontier set
-            if cell_id in f_set[rid]:
-                f_set[rid].remove(cell_id)
-
-                r, c = divmod(cell_id, n)
-                if regions[r][c] != -1:
-                    # already taken by another region expansion
-                    continue
-
-                # claim cell
-                regions[r][c] = rid
-                sizes[rid] += 1
-                unassigned -= 1
+        # claim cell: it leaves every frontier it was on
+        region_of[cell] = rid
+        unassigned -= 1
+        old_size = sizes[rid]
+        sizes[rid] = old_size + 1
+
+        mask = on_front[cell]
+        on_front[cell] = 0
+        touched = []
+        while mask:
+            low = mask & -mask
+            other = low.bit_length() - 1
+            mask ^= low
+            f_live[other] -= 1
+            touched.append(other)
+
+        for nb in neigh[cell]:
+            if region_of[nb] == -1:
+                frontier_add(rid, nb)
+
+        # size bucket bookkeeping for the grown region and any region that ran dry
+        size_drop(old_size)
+        if f_live[rid]:
+            size_count[old_size + 1] = size_count.get(old_size + 1, 0) + 1
+        for other in touched:
+            if other != rid and not f_live[other]:
+                size_drop(sizes[other])
+
+        new_min = min_size
+        if size_count and new_min not in size_count:
+            new_min = min(size_count)
+
+        if new_min != min_size:
+            min_size = new_min
+            tree.weights = [weight(r) for r in range(k)]
+            tree.rebuild()
+        else:
+            tree.set(rid, weight(rid))
+            for other in touched:
+                tree.set(other, weight(other))
+
+    return region_of
 
-                # add new frontier cells
-                for nr, nc in neigh[r][c]:
-                    if regions[nr][nc] == -1:
-                        frontier_add(rid, enc(nr, nc))
 
-                # update eligibility in O(1)
-                if f_set[rid] and not is_eligible[rid]:
-                    is_eligible[rid] = True
-                    eligible_count += 1
-                elif (not f_set[rid]) and is_eligible[rid]:
-                    is_eligible[rid] = False
-                    eligible_count -= 1
-
-                break
-
-        # loop continues until all cells assigned
-
-    return regions
+def _build_regions_from_stars(
+    n: int,
+    star_cols: List[int],
+    rng: random.Random,
+) -> GridInt:
+    """
+    Region rid is seeded at the star of row rid and grown by _grow_regions.
+    """
+    region_of = _grow_regions(n, n, [[r * n + c] for r, c in enumerate(star_cols)], rng)
+    return [region_of[r * n:(r + 1) * n] for r in range(n)]
 
 
 
@@ -238,6 +336,104 @@ def _count_solutions(regions: GridInt, limit: int = 2) -> int:
 
     return backtrack(0, 0, 0)
 
+def _region_tries_chunk(
+    n: int,
+    star_cols: List[int],
+    chunk_seed: int,
+    tries: int,
+    ensure_unique: bool,
+) -> Optional[GridInt]:
+    """
+    Worker for the parallel mode: runs up to `tries` region growths for one
+    star placement with its own RNG and returns the first acceptable partition.
+    Module-level so it can be pickled into a process pool.
+    """
+    rng = random.Random(chunk_seed)
+    for _ in range(tries):
+        try:
+            regions = _build_regions_from_stars(n, star_cols, rng)
+        except RuntimeError:
+            continue
+        if ensure_unique and _count_solutions(regions, limit=2) != 1:
+            continue
+        return regions
+    return None
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _max_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    One process pool (a worker per core) shared by every call, created on first
+    use so its startup cost is paid once. Workers are spawned rather than forked,
+    since forking a threaded server can copy a lock held by another thread.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_max_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _region_tries_parallel(
+    pool: ProcessPoolExecutor,
+    workers: int,
+    n: int,
+    star_cols: List[int],
+    chunk_seeds: List[int],
+    chunk_size: int,
+    total_tries: int,
+    ensure_unique: bool,
+) -> Optional[GridInt]:
+    """
+    Spreads `total_tries` region growths over the pool in chunks, with at most
+    `workers` chunks of this call in flight (the pool is shared between calls).
+    The lowest-indexed successful chunk wins (so the result only depends on the
+    seed, not on scheduling); chunks after it are cancelled as soon as it is known.
+    """
+    in_flight: Dict[Future, int] = {}
+    next_idx = 0
+    best_idx = len(chunk_seeds)
+    best: Optional[GridInt] = None
+
+    def submit_more() -> None:
+        nonlocal next_idx
+        while next_idx < best_idx and len(in_flight) < workers:
+            tries = min(chunk_size, total_tries - next_idx * chunk_size)
+            f = pool.submit(_region_tries_chunk, n, star_cols, chunk_seeds[next_idx], tries, ensure_unique)
+            in_flight[f] = next_idx
+            next_idx += 1
+
+    submit_more()
+    try:
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for f in done:
+                i = in_flight.pop(f)
+                regions = f.result()
+                if regions is not None and i < best_idx:
+                    best_idx, best = i, regions
+            # only chunks before the current winner can still change the answer
+            for f, i in list(in_flight.items()):
+                if i > best_idx:
+                    f.cancel()
+                    del in_flight[f]
+            submit_more()
+    finally:
+        for f in in_flight:
+            f.cancel()
+
+    return best
+
+
 def generate_starbattle_1star(
     n: int,
     *,
@@ -245,6 +441,8 @@ def generate_starbattle_1star(
     seed: Optional[int] = None,
     max_star_tries: int = 2_000,        # ✅ was max_tries
     max_region_tries_per_star: int = 200,  # ✅ NEW: retry regions a lot (cheap)
+    workers: int = 1,
+    region_chunk_size: int = 25,
 ) -> Tuple[GridInt, GridBool]:
     """
     Returns (regions, solution_stars)
@@ -256,32 +454,57 @@ def generate_starbattle_1star(
     Notes:
       - This matches your "Kings" game (1 per row/col/region, no touching).
       - If ensure_unique=True, it retries until the region partition yields a unique solution.
+      - workers > 1 spreads the region tries for each star placement over a shared
+        process pool in chunks of region_chunk_size, each chunk seeded from the
+        main RNG. workers is capped at the number of cores. The output then only
+        depends on (seed, region_chunk_size), not on the worker count.
     """
     if n <= 0:
         raise ValueError("n must be positive.")
+    if workers < 1:
+        raise ValueError("workers must be >= 1.")
+    if region_chunk_size < 1:
+        raise ValueError("region_chunk_size must be >= 1.")
+    workers = min(workers, _max_workers())
     rng = random.Random(seed)
-    neigh = _precompute_neighbors4(n)
+
+    pool = _get_pool() if workers > 1 else None
+    num_chunks = -(-max_region_tries_per_star // region_chunk_size)
 
     for _ in range(max_star_tries):
         # 1) Generate a valid "hidden" star placement
         star_cols = _generate_star_solution(n, rng)
 
         # 2) For that same placement, try many different region partitions
-        for _ in range(max_region_tries_per_star):
-            try:
-                regions = _build_regions_from_stars(n, star_cols, rng, neigh)
-            except RuntimeError:
-                # region growth got stuck; just retry
-                continue
-
-            if ensure_unique:
-                if _count_solutions(regions, limit=2) != 1:
+        if pool is not None:
+            chunk_seeds = [rng.getrandbits(64) for _ in range(num_chunks)]
+            regions = _region_tries_parallel(
+                pool, workers, n, star_cols, chunk_seeds,
+                region_chunk_size, max_region_tries_per_star, ensure_unique,
+            )
+        else:
+            regions = None
+            for _ in range(max_region_tries_per_star):
+                try:
+                    candidate = _build_regions_from_stars(n, star_cols, rng)
+                except RuntimeError:
+                    # region growth got stuck; just retry
                     continue
 
-            stars: GridBool = [[False] * n for _ in range(n)]
-            for r, c in enumerate(star_cols):
-                stars[r][c] = True
-            return regions, stars
+                if ensure_unique:
+                    if _count_solutions(candidate, limit=2) != 1:
+                        continue
+
+                regions = candidate
+                break
+
+        if regions is None:
+            continue
+
+        stars: GridBool = [[False] * n for _ in range(n)]
+        for r, c in enumerate(star_cols):
+            stars[r][c] = True
+        return regions, stars
 
     raise RuntimeError(
         "Failed to generate (unique) puzzle within limits. "
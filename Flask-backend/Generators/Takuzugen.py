@@ -1,141 +1,620 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Tuple
 import random
 
 # Cell values: -1 = empty, 0/1 are the two symbols
 EMPTY = -1
 
+# Largest side length; line tables grow ~2.4x per extra pair of cells
+MAX_SIZE = 20
 
-def _no_three_consecutive(line: List[int]) -> bool:
-    # line may include EMPTY
-    for i in range(len(line) - 2):
-        a, b, c = line[i], line[i + 1], line[i + 2]
-        if a != EMPTY and a == b == c:
-            return False
-    return True
+# The "count" strategy proves uniqueness by search, which blows up on large
+# boards at low ratios (16x16 at 0.3 takes up to 13 s, 20x20 at 0.35 minutes):
+# (max cells, lowest givens_ratio allowed). Boards above COUNT_DEFAULT_CELLS
+# default to "deduce".
+COUNT_DEFAULT_CELLS = 144
+_COUNT_MIN_RATIO = ((144, 0.0), (256, 0.4), (MAX_SIZE * MAX_SIZE, 0.45))
 
 
-def _count_ok(line: List[int]) -> bool:
-    # For size N, each line must have exactly N/2 zeros and N/2 ones.
-    # Partial lines: counts cannot exceed N/2.
-    n = len(line)
+# ----------------------------
+# Line tables: a line of length n is an int with bit i = value of cell i
+# ----------------------------
+@lru_cache(maxsize=None)
+def _valid_lines(n: int) -> Tuple[int, ...]:
+    """
+    All complete lines of length n (n even) with exactly n/2 ones
+    and no three equal symbols in a row, in increasing order.
+    """
     half = n // 2
-    z = sum(1 for x in line if x == 0)
-    o = sum(1 for x in line if x == 1)
-    if z > half or o > half:
-        return False
-    # If complete line, must be exactly half/half
-    if EMPTY not in line:
-        return z == half and o == half
-    return True
-
-
-def _line_signature(line: List[int]) -> Optional[Tuple[int, ...]]:
-    # Only compare duplicates when fully filled
-    if EMPTY in line:
-        return None
-    return tuple(line)
+    out: List[int] = []
+
+    def rec(i: int, mask: int, ones: int, prev1: int, prev2: int) -> None:
+        if i == n:
+            out.append(mask)
+            return
+        for v in (0, 1):
+            if v == prev1 == prev2:
+                continue
+            o = ones + v
+            if o > half or (i + 1 - o) > half:
+                continue
+            rec(i + 1, mask | (v << i), o, v, prev1)
+
+    rec(0, 0, 0, -1, -1)
+    out.sort()
+    return tuple(out)
+
+
+# ----------------------------
+# Propagation: the standard forced deductions, applied to a fixpoint
+# ----------------------------
+# Rules in the order a human would reach for them (lower = easier):
+RULE_PAIRS = 1       # XX -> the cells on both sides take the other symbol
+RULE_GAPS = 2        # X_X -> the gap takes the other symbol
+RULE_COUNT = 3       # a line holding half of one symbol gets the other everywhere else
+RULE_DUPLICATE = 4   # a line with 2 blanks must not complete into an existing line
+_RULES = (RULE_PAIRS, RULE_GAPS, RULE_COUNT, RULE_DUPLICATE)
+GRADE_SEARCH = 5     # the rules stall; guessing (search) is needed
+
+DIFFICULTY_NAMES = {
+    0: "trivial",
+    RULE_PAIRS: "pairs",
+    RULE_GAPS: "gaps",
+    RULE_COUNT: "count",
+    RULE_DUPLICATE: "duplicate",
+    GRADE_SEARCH: "search",
+}
+_DIFFICULTY_LEVELS = {name: level for level, name in DIFFICULTY_NAMES.items()}
+
+
+@dataclass(frozen=True)
+class TakuzuGrade:
+    level: int                    # hardest rule needed (RULE_*), GRADE_SEARCH, or 0 if nothing to do
+    rules_used: Tuple[int, ...]   # every rule that forced at least one cell
+    name: str                     # DIFFICULTY_NAMES[level]
+
+
+@lru_cache(maxsize=None)
+def _board_lines(rows: int, cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """Flat cell ids of every row, then every column."""
+    return tuple(
+        [tuple(r * cols + c for c in range(cols)) for r in range(rows)]
+        + [tuple(r * cols + c for r in range(rows)) for c in range(cols)]
+    )
 
 
-def _valid_after_set(grid: List[List[int]], r: int, c: int, n: int) -> bool:
-    # row/col constraints
-    row = grid[r]
-    col = [grid[i][c] for i in range(n)]
+class _Propagator:
+    """
+    Flat-board Takuzu state with a trail for undo.
+
+    Lines 0..rows-1 are rows, rows..rows+cols-1 are columns. Each line keeps
+    zero/one counts plus filled/ones bitmasks (bit = position in the line), so
+    the rules and the "no duplicate lines" check are bit operations.
+    assign() only enqueues the two touched lines, and only for rules that can
+    fire on them; propagate() drains the queue,
+    always applying the lowest rule that still has work, and records the
+    highest rule that actually forced a cell in `hardest` (and all of them in
+    `rules_used`). Because lower rules are always at a fixpoint before a higher
+    one runs, that is the grade a human solver would need.
+    """
 
-    if not _no_three_consecutive(row) or not _no_three_consecutive(col):
-        return False
-    if not _count_ok(row) or not _count_ok(col):
-        return False
+    def __init__(self, grid: List[List[int]]) -> None:
+        rows, cols = len(grid), len(grid[0])
+        self.rows, self.cols = rows, cols
+        self.cells = [v for row in grid for v in row]
+        self.lines = _board_lines(rows, cols)
+        nlines = rows + cols
+        self.half = [cols // 2] * rows + [rows // 2] * cols
+        self.zeros = [0] * nlines
+        self.ones = [0] * nlines
+        self.filled = [0] * nlines
+        self.value = [0] * nlines
+        self.trail = [cell for cell, v in enumerate(self.cells) if v != EMPTY]
+        self.pending = {rule: set(range(nlines)) for rule in _RULES}
+        self.hardest = 0
+        self.rules_used = set()
+
+        # load the givens in bulk, then check every line once
+        cells = self.cells
+        for line, members in enumerate(self.lines):
+            filled = value = 0
+            for pos, cell in enumerate(members):
+                v = cells[cell]
+                if v != EMPTY:
+                    filled |= 1 << pos
+                    if v:
+                        value |= 1 << pos
+            self.filled[line], self.value[line] = filled, value
+            self.ones[line] = bin(value).count("1")
+            self.zeros[line] = bin(filled).count("1") - self.ones[line]
+        self.ok = all(self._line_ok(line) for line in range(nlines))
+
+    def _line_ok(self, line: int) -> bool:
+        half = self.half[line]
+        if self.zeros[line] > half or self.ones[line] > half:
+            return False
+        value = self.value[line]
+        zeros = self.filled[line] & ~value
+        if value & (value >> 1) & (value >> 2) or zeros & (zeros >> 1) & (zeros >> 2):
+            return False
+        if self.zeros[line] + self.ones[line] == 2 * half:
+            return self._line_is_new(line)
+        return True
+
+    # -- state changes ------------------------------------------------------
+    def _line_ids(self, cell: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        r, c = divmod(cell, self.cols)
+        return (r, c), (self.rows + c, r)
+
+    def assign(self, cell: int, v: int) -> bool:
+        """Set cell to v; False on an immediate contradiction (state stays valid for undo)."""
+        cur = self.cells[cell]
+        if cur != EMPTY:
+            return cur == v
+        self.cells[cell] = v
+        self.trail.append(cell)
+        ok = True
+        for line, pos in self._line_ids(cell):
+            bit = 1 << pos
+            self.filled[line] |= bit
+            if v:
+                self.value[line] |= bit
+                self.ones[line] += 1
+                if self.ones[line] > self.half[line]:
+                    ok = False
+            else:
+                self.zeros[line] += 1
+                if self.zeros[line] > self.half[line]:
+                    ok = False
+            if ok and not self._no_triple_at(line, pos):
+                ok = False
+            if not ok:
+                continue
 
-    # "No identical rows/cols" rule (only check when a line becomes complete)
-    row_sig = _line_signature(row)
-    if row_sig is not None:
-        for rr in range(n):
-            if rr != r and _line_signature(grid[rr]) == row_sig:
+            # only queue the rules that can fire on this line now
+            half, z, o = self.half[line], self.zeros[line], self.ones[line]
+            pending = self.pending
+            if z + o == 2 * half:
+                if not self._line_is_new(line):
+                    ok = False
+                else:
+                    # a new complete line can unlock the duplicate rule on parallel lines
+                    pending[RULE_DUPLICATE].update(
+                        other for other in self._parallel(line)
+                        if self.zeros[other] == self.ones[other] == self.half[other] - 1
+                    )
+                continue
+            pending[RULE_PAIRS].add(line)
+            pending[RULE_GAPS].add(line)
+            if z == half or o == half:
+                pending[RULE_COUNT].add(line)
+            if z == o == half - 1:
+                pending[RULE_DUPLICATE].add(line)
+        return ok
+
+    def undo(self, mark: int) -> None:
+        """Revert every assignment made after len(trail) was `mark`."""
+        trail = self.trail
+        while len(trail) > mark:
+            cell = trail.pop()
+            v = self.cells[cell]
+            self.cells[cell] = EMPTY
+            for line, pos in self._line_ids(cell):
+                bit = 1 << pos
+                self.filled[line] &= ~bit
+                if v:
+                    self.value[line] &= ~bit
+                    self.ones[line] -= 1
+                else:
+                    self.zeros[line] -= 1
+        for pend in self.pending.values():
+            pend.clear()
+
+    # -- checks -------------------------------------------------------------
+    def _parallel(self, line: int) -> range:
+        return range(self.rows) if line < self.rows else range(self.rows, self.rows + self.cols)
+
+    def _no_triple_at(self, line: int, pos: int) -> bool:
+        filled, value = self.filled[line], self.value[line]
+        zeros = filled & ~value
+        for start in (pos - 2, pos - 1, pos):
+            if start < 0:
+                continue
+            window = 0b111 << start
+            if value & window == window or zeros & window == window:
                 return False
+        return True
 
-    col_sig = _line_signature(col)
-    if col_sig is not None:
-        for cc in range(n):
-            if cc != c:
-                other_col = [grid[i][cc] for i in range(n)]
-                if _line_signature(other_col) == col_sig:
+    def _line_is_new(self, line: int) -> bool:
+        v = self.value[line]
+        full = self.filled[line]
+        for other in self._parallel(line):
+            if other != line and self.filled[other] == full and self.value[other] == v:
+                return False
+        return True
+
+    def is_complete(self) -> bool:
+        return len(self.trail) == len(self.cells)
+
+    # -- rules --------------------------------------------------------------
+    def _apply_rule(self, rule: int, line: int) -> Optional[bool]:
+        """
+        Apply one rule to one line. Returns False on contradiction, True if a
+        cell was forced, None if the rule had nothing to say.
+        All rules are computed on the line's bitmasks: to0 / to1 collect the
+        positions forced to 0 / 1.
+        """
+        cells = self.lines[line]
+        m = len(cells)
+        full = (1 << m) - 1
+        filled, ones = self.filled[line], self.value[line]
+        blanks = full & ~filled
+        if not blanks:
+            return None
+        zeros = filled & ~ones
+        to0 = to1 = 0
+
+        if rule == RULE_PAIRS:
+            # a pair at (i, i+1) forces i-1 and i+2
+            p1, p0 = ones & (ones >> 1), zeros & (zeros >> 1)
+            to0 = ((p1 >> 1) | (p1 << 2)) & blanks
+            to1 = ((p0 >> 1) | (p0 << 2)) & blanks
+        elif rule == RULE_GAPS:
+            # equal symbols at i and i+2 force i+1
+            to0 = ((ones & (ones >> 2)) << 1) & blanks
+            to1 = ((zeros & (zeros >> 2)) << 1) & blanks
+        elif rule == RULE_COUNT:
+            half = self.half[line]
+            if self.zeros[line] == half:
+                to1 = blanks
+            elif self.ones[line] == half:
+                to0 = blanks
+        else:
+            half = self.half[line]
+            if self.zeros[line] == half - 1 and self.ones[line] == half - 1:
+                for other in self._parallel(line):
+                    if self.filled[other] == full and self.value[other] & filled == ones:
+                        # completing like `other` is illegal, so flip both blanks
+                        to0 = self.value[other] & blanks
+                        to1 = blanks & ~to0
+                        break
+
+        if not to0 and not to1:
+            return None
+        if to0 & to1:
+            return False
+        for mask, v in ((to0, 0), (to1, 1)):
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                if not self.assign(cells[low.bit_length() - 1], v):
                     return False
+        self.hardest = max(self.hardest, rule)
+        self.rules_used.add(rule)
+        return True
 
-    return True
+    def propagate(self, max_rule: int = RULE_DUPLICATE) -> bool:
+        """Run rules up to max_rule to a fixpoint. False on contradiction."""
+        if not self.ok:
+            return False
+        while True:
+            for rule in _RULES:
+                if rule > max_rule:
+                    continue
+                pend = self.pending[rule]
+                if pend:
+                    break
+            else:
+                return True
+            line = pend.pop()
+            if self._apply_rule(rule, line) is False:
+                return False
+
+    def most_constrained_cell(self) -> int:
+        """Empty cell whose row and column have the fewest blanks left (MRV)."""
+        best, best_score = -1, 1 << 30
+        rows, cols = self.rows, self.cols
+        row_blanks = [cols - self.zeros[r] - self.ones[r] for r in range(rows)]
+        col_blanks = [rows - self.zeros[rows + c] - self.ones[rows + c] for c in range(cols)]
+        for cell, v in enumerate(self.cells):
+            if v == EMPTY:
+                r, c = divmod(cell, cols)
+                score = row_blanks[r] + col_blanks[c]
+                if score < best_score:
+                    best, best_score = cell, score
+        return best
+
+    def to_grid(self) -> List[List[int]]:
+        cols = self.cols
+        return [self.cells[r * cols:(r + 1) * cols] for r in range(self.rows)]
+
+
+def _search_propagate(
+    prop: _Propagator,
+    limit: int,
+    rng: Optional[random.Random] = None,
+    found: Optional[List[List[List[int]]]] = None,
+) -> int:
+    """
+    Propagate-then-branch search. Counts solutions up to `limit`; branches on the
+    MRV cell (values in random order when rng is given) and undoes via the trail,
+    so completed grids are only visible through `found` (appended if provided).
+    """
+    if not prop.propagate():
+        return 0
+    if prop.is_complete():
+        if found is not None:
+            found.append(prop.to_grid())
+        return 1
 
+    cell = prop.most_constrained_cell()
+    vals = [0, 1]
+    if rng is not None:
+        rng.shuffle(vals)
 
-def _find_next_cell(grid: List[List[int]]) -> Optional[Tuple[int, int]]:
-    n = len(grid)
-    for r in range(n):
-        for c in range(n):
-            if grid[r][c] == EMPTY:
-                return r, c
-    return None
+    total = 0
+    for v in vals:
+        mark = len(prop.trail)
+        if prop.assign(cell, v):
+            total += _search_propagate(prop, limit - total, rng, found)
+        prop.undo(mark)
+        if total >= limit:
+            break
+    return total
 
 
 def _solve_count_solutions(
     grid: List[List[int]],
     limit: int = 2,
+    found: Optional[List[List[List[int]]]] = None,
 ) -> int:
     """
     Counts solutions up to 'limit' (early exit). Used for uniqueness checking.
+    Propagates the forced deductions, then branches on the most constrained cell.
+    Solutions seen are appended to `found` if provided. Does not modify grid.
     """
-    n = len(grid)
-    nxt = _find_next_cell(grid)
-    if nxt is None:
-        return 1
+    prop = _Propagator(grid)
+    if not prop.ok:
+        return 0
+    return _search_propagate(prop, limit, found=found)
 
-    r, c = nxt
-    # Try 0/1
-    total = 0
-    for v in (0, 1):
-        grid[r][c] = v
-        if _valid_after_set(grid, r, c, n):
-            total += _solve_count_solutions(grid, limit)
-            if total >= limit:
-                grid[r][c] = EMPTY
-                return total
-        grid[r][c] = EMPTY
-    return total
 
+def _grid_bits(grid: List[List[int]]) -> int:
+    """Complete grid as one int: bit r*cols + c is set where the cell is 1."""
+    cols = len(grid[0])
+    bits = 0
+    for r, row in enumerate(grid):
+        for c, v in enumerate(row):
+            if v == 1:
+                bits |= 1 << (r * cols + c)
+    return bits
 
-def _generate_full_solution(n: int, rng: random.Random) -> List[List[int]]:
+
+@lru_cache(maxsize=None)
+def _suffix_feasible(ones_left: int, zeros_left: int, last: int, run: int) -> bool:
     """
-    Generates a complete valid Takuzu solution by backtracking.
-    Assumes n is even.
+    Can a line that currently ends in `run` copies of `last` be finished with
+    exactly ones_left ones and zeros_left zeros, never three equal in a row?
     """
-    grid = [[EMPTY] * n for _ in range(n)]
+    if ones_left < 0 or zeros_left < 0 or run > 2:
+        return False
+    if ones_left == 0 and zeros_left == 0:
+        return True
+    for v, o, z in ((1, ones_left - 1, zeros_left), (0, ones_left, zeros_left - 1)):
+        if _suffix_feasible(o, z, v, run + 1 if v == last else 1):
+            return True
+    return False
 
-    # simple heuristic ordering: randomize choices per cell
-    def backtrack() -> bool:
-        nxt = _find_next_cell(grid)
-        if nxt is None:
+
+def _generate_full_solution(rows: int, cols: int, rng: random.Random) -> List[List[int]]:
+    """
+    Generates a complete valid Takuzu solution by sampling whole rows from the
+    cached table of valid lines, with backtracking over rows.
+
+    Column state is carried incrementally between rows (ones count, last two
+    rows) and turned into two masks per row: columns whose next cell must be 0 /
+    must be 1 for the column to still have a legal completion (_suffix_feasible).
+    That covers "no three in a row" and the half counts, so each row is a plain
+    mask filter over the table. Columns sharing a prefix must still be able to
+    diverge in the rows that are left, and a small node budget with restarts
+    keeps unlucky early rows from thrashing.
+    Assumes rows and cols are even.
+    """
+    table = _valid_lines(cols)
+    table_set = frozenset(table)
+    full = (1 << cols) - 1
+    half = rows // 2
+    budget = 20 * rows
+
+    chosen: List[int] = []
+    used = set()
+    ones = [0] * cols
+    prefixes = [0] * cols
+    nodes = 0
+
+    def prefixes_ok(r: int) -> bool:
+        # k columns sharing a prefix need k distinct suffixes of length rows-1-r
+        room = 1 << (rows - 1 - r)
+        counts: dict = {}
+        for p in prefixes:
+            k = counts.get(p, 0) + 1
+            if k > room:
+                return False
+            counts[p] = k
+        return True
+
+    def column_masks(r: int) -> Optional[Tuple[int, int]]:
+        must0 = must1 = 0
+        prev = chosen[r - 1] if r >= 1 else 0
+        prev2 = chosen[r - 2] if r >= 2 else 0
+        for c in range(cols):
+            o = ones[c]
+            z = r - o
+            if r == 0:
+                last, run = -1, 0
+            else:
+                last = (prev >> c) & 1
+                run = 2 if r >= 2 and (prev2 >> c) & 1 == last else 1
+            ok1 = _suffix_feasible(half - o - 1, half - z, 1, run + 1 if last == 1 else 1)
+            ok0 = _suffix_feasible(half - o, half - z - 1, 0, run + 1 if last == 0 else 1)
+            if not ok0 and not ok1:
+                return None
+            if not ok0:
+                must1 |= 1 << c
+            elif not ok1:
+                must0 |= 1 << c
+        return must0, must1
+
+    def backtrack(r: int) -> Optional[bool]:
+        nonlocal nodes
+        if r == rows:
             return True
-        r, c = nxt
-        vals = [0, 1]
-        rng.shuffle(vals)
-        for v in vals:
-            grid[r][c] = v
-            if _valid_after_set(grid, r, c, n) and backtrack():
+        nodes += 1
+        if nodes > budget:
+            return None
+
+        masks = column_masks(r)
+        if masks is None:
+            return False
+        must0, must1 = masks
+
+        if must0 | must1 == full:
+            # fully forced row (typically the last one): no table scan needed
+            cands = [must1] if must1 in table_set and must1 not in used else []
+        else:
+            cands = [x for x in table if not x & must0 and x & must1 == must1 and x not in used]
+            rng.shuffle(cands)
+        for x in cands:
+            for c in range(cols):
+                v = (x >> c) & 1
+                ones[c] += v
+                prefixes[c] |= v << r
+
+            res: Optional[bool] = False
+            if prefixes_ok(r):
+                chosen.append(x)
+                used.add(x)
+                res = backtrack(r + 1)
+                if not res:
+                    chosen.pop()
+                    used.discard(x)
+
+            if res:
                 return True
-            grid[r][c] = EMPTY
+            for c in range(cols):
+                v = (x >> c) & 1
+                ones[c] -= v
+                prefixes[c] &= ~(v << r)
+            if res is None:
+                return None
         return False
 
-    if not backtrack():
-        raise RuntimeError("Failed to generate a full solution (try a different seed).")
+    for _ in range(1000):
+        nodes = 0
+        res = backtrack(0)
+        if res:
+            return [[(x >> c) & 1 for c in range(cols)] for x in chosen]
+        if res is False:
+            break
+
+    raise RuntimeError("Failed to generate a full solution (try a different seed).")
+
+
+def _deduction_grade(grid: List[List[int]], max_rule: int = RULE_DUPLICATE) -> Optional[int]:
+    """
+    Hardest rule needed when rules up to max_rule alone fill the grid (which
+    also implies a unique solution); None if they stall or contradict.
+    """
+    prop = _Propagator(grid)
+    if prop.propagate(max_rule) and prop.is_complete():
+        return prop.hardest
+    return None
+
+
+def grade_binary_puzzle(puzzle: List[List[int]]) -> TakuzuGrade:
+    """
+    Grades a puzzle by the deduction rules needed to solve it, always using the
+    easiest rule that still makes progress. GRADE_SEARCH means the rules stall
+    before the grid is full.
+    """
+    prop = _Propagator(puzzle)
+    if not prop.propagate():
+        raise ValueError("Puzzle has no solution.")
+    level = prop.hardest if prop.is_complete() else GRADE_SEARCH
+    return TakuzuGrade(
+        level=level,
+        rules_used=tuple(sorted(prop.rules_used)),
+        name=DIFFICULTY_NAMES[level],
+    )
+
+
+def _remove_by_deduction(
+    puzzle: List[List[int]],
+    positions: List[Tuple[int, int]],
+    to_remove: int,
+    max_checks: int,
+    max_rule: int = RULE_DUPLICATE,
+    until_rule: int = 0,
+) -> int:
+    """
+    Blanks cells from `positions` (in order) while the puzzle stays solvable by
+    deduction alone (rules up to max_rule). After to_remove cells are gone it
+    keeps going only while the puzzle still needs less than until_rule.
+
+    Cells are tried in batches: a batch that still deduces is kept whole, a
+    failing batch is split in half and each half retried, down to single cells.
+    Fewer givens never make deduction easier, so a cell that fails once is never
+    retried. The batch grows after a clean success and shrinks after a split.
+    Returns how many cells were removed.
+    """
+    removed = 0
+    checks = 0
+    batch = 4
+    grade = 0   # grade of the current puzzle: only successful checks change it
+
+    def try_batch(cells: List[Tuple[int, int]]) -> int:
+        nonlocal checks, grade
+        if not cells or checks >= max_checks:
+            return 0
+        checks += 1
+        backup = [puzzle[r][c] for r, c in cells]
+        for r, c in cells:
+            puzzle[r][c] = EMPTY
+        level = _deduction_grade(puzzle, max_rule)
+        if level is not None:
+            grade = level
+            return len(cells)
+        for (r, c), v in zip(cells, backup):
+            puzzle[r][c] = v
+        if len(cells) == 1:
+            return 0
+        mid = len(cells) // 2
+        got = try_batch(cells[:mid])
+        return got + try_batch(cells[mid:])
+
+    i = 0
+    while i < len(positions) and (removed < to_remove or grade < until_rule) and checks < max_checks:
+        cells = positions[i:i + max(1, min(batch, to_remove - removed))]
+        i += len(cells)
+        got = try_batch(cells)
+        removed += got
+        batch = batch * 2 if got == len(cells) else max(1, batch // 2)
 
-    return grid
+    return removed
 
 
 def generate_binary_puzzle(
     n: int,
     *,
+    cols: Optional[int] = None,
     givens_ratio: float = 0.45,
     ensure_unique: bool = True,
     seed: Optional[int] = None,
     max_removal_attempts: int = 50_000,
+    removal_strategy: Optional[str] = None,
+    target_difficulty: Optional[str] = None,
 ) -> Tuple[List[List[int]], List[List[int]]]:
     """
     Generates a Binary Puzzle (Takuzu/Binairo).
@@ -145,40 +624,105 @@ def generate_binary_puzzle(
       solution: full solved grid (0/1)
 
     Params:
-      n: board size (must be even; typical 6, 8, 10, 12...)
+      n: board size (must be even; typical 6, 8, 10, 12...); the number of rows
+         when cols is given
+      cols: number of columns for rectangular boards (must be even; defaults to n)
       givens_ratio: fraction of cells left filled (lower => harder)
       ensure_unique: if True, removes cells only if puzzle still has 1 solution
       seed: RNG seed
       max_removal_attempts: safety bound
+      removal_strategy: with ensure_unique, how a removal is accepted:
+        "count"  - the solver still finds exactly 1 solution (the puzzle may
+                   need search)
+        "deduce" - the forced deductions alone still solve the puzzle; stronger
+                   (unique and logically solvable), polynomial per check, and
+                   removals are tried in batches
+        None (default) picks "count" up to COUNT_DEFAULT_CELLS cells (12x12)
+        and "deduce" above, unless target_difficulty is "search". "count" on
+        larger boards needs givens_ratio >= 0.4 (0.45 above 256 cells).
+      target_difficulty: one of DIFFICULTY_NAMES' values. Removals that would
+        need a harder grade are rejected; if the grade is not reached at
+        givens_ratio, removal keeps going until it is (or nothing more can go).
+        Use grade_binary_puzzle() to read the grade that was achieved.
     """
-    if n <= 0 or n % 2 != 0:
-        raise ValueError("n must be a positive even number (e.g., 6, 8, 10).")
+    rows = n
+    cols = n if cols is None else cols
+    if rows <= 0 or rows % 2 != 0 or cols <= 0 or cols % 2 != 0:
+        raise ValueError("n and cols must be positive even numbers (e.g., 6, 8, 10).")
+    if rows > MAX_SIZE or cols > MAX_SIZE:
+        raise ValueError(f"n and cols must be at most {MAX_SIZE}.")
+    if cols > len(_valid_lines(rows)) or rows > len(_valid_lines(cols)):
+        raise ValueError("Board too narrow: not enough distinct valid lines for the other side.")
     if not (0.05 <= givens_ratio <= 0.95):
         raise ValueError("givens_ratio should be between 0.05 and 0.95.")
+    if removal_strategy not in (None, "count", "deduce"):
+        raise ValueError("removal_strategy must be 'count' or 'deduce'.")
+    target_level: Optional[int] = None
+    if target_difficulty is not None:
+        if target_difficulty not in _DIFFICULTY_LEVELS:
+            raise ValueError(
+                "target_difficulty must be one of: " + ", ".join(DIFFICULTY_NAMES.values()) + "."
+            )
+        target_level = _DIFFICULTY_LEVELS[target_difficulty]
+        if not ensure_unique:
+            raise ValueError("target_difficulty requires ensure_unique=True.")
+        if removal_strategy == "deduce" and target_level == GRADE_SEARCH:
+            raise ValueError("removal_strategy='deduce' cannot reach target_difficulty='search'.")
+    if removal_strategy is None:
+        large = rows * cols > COUNT_DEFAULT_CELLS and target_level != GRADE_SEARCH
+        removal_strategy = "deduce" if large else "count"
+    if ensure_unique and removal_strategy == "count":
+        min_ratio = next(ratio for cells, ratio in _COUNT_MIN_RATIO if rows * cols <= cells)
+        if givens_ratio < min_ratio:
+            raise ValueError(
+                f"removal_strategy='count' needs givens_ratio >= {min_ratio} on {rows}x{cols}; "
+                "use removal_strategy='deduce' for sparser puzzles."
+            )
 
     rng = random.Random(seed)
 
-    solution = _generate_full_solution(n, rng)
+    solution = _generate_full_solution(rows, cols, rng)
     puzzle = [row[:] for row in solution]
 
-    total_cells = n * n
+    total_cells = rows * cols
     target_givens = int(round(total_cells * givens_ratio))
     to_remove = total_cells - target_givens
 
     # Create a randomized list of positions to try removing
-    positions = [(r, c) for r in range(n) for c in range(n)]
+    positions = [(r, c) for r in range(rows) for c in range(cols)]
     rng.shuffle(positions)
 
+    if ensure_unique and removal_strategy == "deduce":
+        max_rule = target_level if target_level is not None else RULE_DUPLICATE
+        _remove_by_deduction(
+            puzzle, positions, to_remove, max_removal_attempts,
+            max_rule=max_rule, until_rule=target_level or 0,
+        )
+        return puzzle, solution
+
     removed = 0
     attempts = 0
+    target_met = target_level is None
+
+    # Counterexample bank: every second solution a failed check turns up, stored
+    # as (alternate XOR solution). Givens only ever shrink, so once an alternate
+    # disagrees with the givens at just (r, c), removing (r, c) can never be unique.
+    solution_bits = _grid_bits(solution)
+    givens_bits = _grid_bits([[int(v != EMPTY) for v in row] for row in puzzle])
+    alternates: List[int] = []
+    progress_this_pass = False
 
     # Remove cells while preserving solvability (and uniqueness if requested)
     i = 0
-    while removed < to_remove and attempts < max_removal_attempts:
+    while (removed < to_remove or not target_met) and attempts < max_removal_attempts:
         attempts += 1
         if i >= len(positions):
+            # a pass that removed nothing means every remaining given is pinned
+            if not progress_this_pass:
+                break
             rng.shuffle(positions)
             i = 0
+            progress_this_pass = False
 
         r, c = positions[i]
         i += 1
@@ -186,25 +730,39 @@ def generate_binary_puzzle(
         if puzzle[r][c] == EMPTY:
             continue
 
+        bit = 1 << (r * cols + c)
         backup = puzzle[r][c]
-        puzzle[r][c] = EMPTY
 
         if ensure_unique:
+            if any(diff & givens_bits == bit for diff in alternates):
+                continue
+
+            puzzle[r][c] = EMPTY
             # Count solutions; must be exactly 1
-            test_grid = [row[:] for row in puzzle]
-            sol_count = _solve_count_solutions(test_grid, limit=2)
+            found: List[List[List[int]]] = []
+            sol_count = _solve_count_solutions(puzzle, limit=2, found=found)
             if sol_count != 1:
                 puzzle[r][c] = backup
+                alternates.extend(_grid_bits(g) ^ solution_bits for g in found if g != solution)
                 continue
+
+            if target_level is not None:
+                level = grade_binary_puzzle(puzzle).level
+                if level > target_level:
+                    puzzle[r][c] = backup
+                    continue
+                target_met = level == target_level
         else:
+            puzzle[r][c] = EMPTY
             # Just ensure at least one solution (fast check via count>=1)
-            test_grid = [row[:] for row in puzzle]
-            sol_count = _solve_count_solutions(test_grid, limit=1)
+            sol_count = _solve_count_solutions(puzzle, limit=1)
             if sol_count < 1:
                 puzzle[r][c] = backup
                 continue
 
+        givens_bits &= ~bit
         removed += 1
+        progress_this_pass = True
 
     return puzzle, solution
 
@@ -3,15 +3,18 @@ from flask_cors import CORS
 import sys
 import os
 import time
+import threading
+import uuid
+from collections import OrderedDict
 # Add Generators directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'Generators'))
 
 from Netwalkgen import generate_network, build_tiles_from_puzzle
 from Shikakugen import generate_shikaku_board
 from Starbattlegen import generate_starbattle_1star
-from Takuzugen import generate_binary_puzzle, EMPTY
+from Takuzugen import generate_binary_puzzle, grade_binary_puzzle, DIFFICULTY_NAMES, EMPTY
 from Litsgen import generate_lits
-from Mastermindgen import generate_mastermind_secret, MastermindConfig
+from Mastermindgen import generate_mastermind_secret, MastermindConfig, MastermindSession, STRATEGIES, strategy_stats
 from Floodfillgen import generate_mosaic
 from Bridgesgen import generate_atoms
 from Numbersnakegen import generate_snap
@@ -178,6 +181,9 @@ def generate_starbattle():
 
         max_star_tries = int(data.get('max_star_tries', 3000))
         max_region_tries = int(data.get('max_region_tries_per_star', 300))
+        # one process per core at most; the generator shares a single pool
+        workers = min(int(data.get('workers', 1)), os.cpu_count() or 1)
+        region_chunk_size = int(data.get('region_chunk_size', 25))
         
         # Generate puzzle
         regions, solution_stars = generate_starbattle_1star(
@@ -185,7 +191,9 @@ def generate_starbattle():
             ensure_unique=ensure_unique,
             seed=seed,
             max_star_tries=max_star_tries,
-            max_region_tries_per_star=max_region_tries
+            max_region_tries_per_star=max_region_tries,
+            workers=workers,
+            region_chunk_size=region_chunk_size
         )
         
         # Convert to JSON-serializable format
@@ -223,30 +231,43 @@ def generate_takuzu():
             data = request.args.to_dict()
         
         n = int(data.get('size', 8))
+        rows = int(data.get('rows', n))
+        cols = int(data.get('cols', rows if 'rows' in data else n))
         givens_ratio = float(data.get('givens_ratio', 0.45))
         ensure_unique = data.get('ensure_unique', 'true').lower() == 'true'
         seed = int(data.get('seed')) if data.get('seed') else None
         max_removal_attempts = int(data.get('max_removal_attempts', 50000))
+        removal_strategy = data.get('removal_strategy') or None
+        target_difficulty = data.get('target_difficulty') or None
         
         # Generate puzzle
         puzzle, solution = generate_binary_puzzle(
-            n,
+            rows,
+            cols=cols,
             givens_ratio=givens_ratio,
             ensure_unique=ensure_unique,
             seed=seed,
-            max_removal_attempts=max_removal_attempts
+            max_removal_attempts=max_removal_attempts,
+            removal_strategy=removal_strategy,
+            target_difficulty=target_difficulty
         )
+        grade = grade_binary_puzzle(puzzle)
         
         # Convert EMPTY (-1) to None for cleaner JSON, or keep as -1
-        puzzle_grid = [[int(puzzle[r][c]) if puzzle[r][c] != EMPTY else None for c in range(n)] for r in range(n)]
-        solution_grid = [[int(solution[r][c]) for c in range(n)] for r in range(n)]
+        puzzle_grid = [[int(puzzle[r][c]) if puzzle[r][c] != EMPTY else None for c in range(cols)] for r in range(rows)]
+        solution_grid = [[int(solution[r][c]) for c in range(cols)] for r in range(rows)]
         
         return jsonify({
             'success': True,
-            'size': n,
+            'size': rows if rows == cols else None,
+            'rows': rows,
+            'cols': cols,
             'puzzle': puzzle_grid,
             'solution': solution_grid,
-            'givens_ratio': givens_ratio
+            'givens_ratio': givens_ratio,
+            'difficulty': grade.name,
+            'difficulty_level': grade.level,
+            'rules_used': [DIFFICULTY_NAMES[rule] for rule in grade.rules_used]
         })
     except Exception as e:
         return jsonify({
@@ -333,6 +354,7 @@ def generate_mastermind():
         max_attempts = int(data.get('max_attempts', 10))
         enforce_solvable_within_attempts = data.get('enforce_solvable_within_attempts', 'true').lower() == 'true'
         max_tries = int(data.get('max_tries', 50000))
+        strategy = data.get('strategy', 'minimax')
         seed = int(data.get('seed')) if data.get('seed') else None
         
         # Create config
@@ -349,7 +371,8 @@ def generate_mastermind():
             avoid_trivial=avoid_trivial,
             max_attempts=max_attempts,
             enforce_solvable_within_attempts=enforce_solvable_within_attempts,
-            max_tries=max_tries
+            max_tries=max_tries,
+            strategy=strategy
         )
         
         # Convert to JSON-serializable format
@@ -359,7 +382,53 @@ def generate_mastermind():
             'code_len': secret.config.code_len,
             'num_colors': secret.config.num_colors,
             'allow_repeats': secret.config.allow_repeats,
-            'max_attempts': secret.max_attempts
+            'max_attempts': secret.max_attempts,
+            'solver_steps': secret.solver_steps,
+            'strategy': strategy
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/mastermind/stats', methods=['GET', 'POST'])
+def mastermind_stats():
+    """Solver step statistics per strategy for a Mastermind config"""
+    try:
+        # Get parameters from request
+        if request.method == 'POST':
+            data = request.get_json() or {}
+        else:
+            data = request.args.to_dict()
+        
+        code_len = int(data.get('code_len', 4))
+        num_colors = int(data.get('num_colors', 4))
+        allow_repeats = data.get('allow_repeats', 'true').lower() == 'true'
+        strategy = data.get('strategy')
+        
+        config = MastermindConfig(
+            code_len=code_len,
+            num_colors=num_colors,
+            allow_repeats=allow_repeats
+        )
+        strategies = [strategy] if strategy else list(STRATEGIES)
+        
+        stats = {}
+        for name in strategies:
+            s = strategy_stats(config, name)
+            stats[name] = {
+                'average': s.average,
+                'worst': s.worst,
+                'distribution': {str(steps): count for steps, count in s.distribution}
+            }
+        
+        return jsonify({
+            'success': True,
+            'code_len': code_len,
+            'num_colors': num_colors,
+            'allow_repeats': allow_repeats,
+            'strategies': stats
         })
     except Exception as e:
         return jsonify({
@@ -367,6 +436,123 @@ def generate_mastermind():
             'error': str(e)
         }), 400
 
+# In-memory Mastermind sessions (oldest dropped first once the cap is reached)
+MAX_MASTERMIND_SESSIONS = 1000
+_mastermind_sessions = OrderedDict()
+_mastermind_sessions_lock = threading.Lock()
+
+def _mastermind_session_state(session_id, session):
+    state = {
+        'success': True,
+        'session_id': session_id,
+        'code_len': session.secret.config.code_len,
+        'num_colors': session.secret.config.num_colors,
+        'allow_repeats': session.secret.config.allow_repeats,
+        'max_attempts': session.secret.max_attempts,
+        'strategy': session.strategy,
+        'attempts_used': session.attempts_used,
+        'candidates_remaining': session.candidates_remaining,
+        'solved': session.solved,
+        'game_over': session.game_over,
+        'guesses': [
+            {'guess': list(code), 'exact': exact, 'color_only': color_only}
+            for code, (exact, color_only) in session.guesses
+        ]
+    }
+    if session.game_over:
+        state['code'] = list(session.secret.code)
+    return state
+
+@app.route('/api/mastermind/session', methods=['POST'])
+def create_mastermind_session():
+    """Start a server-side Mastermind game"""
+    try:
+        data = request.get_json() or {}
+        
+        config = MastermindConfig(
+            code_len=int(data.get('code_len', 4)),
+            num_colors=int(data.get('num_colors', 4)),
+            allow_repeats=str(data.get('allow_repeats', 'true')).lower() == 'true'
+        )
+        strategy = data.get('strategy', 'minimax')
+        seed = int(data.get('seed')) if data.get('seed') else None
+        
+        secret = generate_mastermind_secret(
+            seed=seed,
+            config=config,
+            avoid_trivial=str(data.get('avoid_trivial', 'true')).lower() == 'true',
+            max_attempts=int(data.get('max_attempts', 10)),
+            enforce_solvable_within_attempts=str(data.get('enforce_solvable_within_attempts', 'true')).lower() == 'true',
+            max_tries=int(data.get('max_tries', 50000)),
+            strategy=strategy
+        )
+        session = MastermindSession(secret, strategy=strategy)
+        session_id = uuid.uuid4().hex
+        
+        with _mastermind_sessions_lock:
+            _mastermind_sessions[session_id] = session
+            while len(_mastermind_sessions) > MAX_MASTERMIND_SESSIONS:
+                _mastermind_sessions.popitem(last=False)
+        
+        return jsonify(_mastermind_session_state(session_id, session))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/api/mastermind/session/<session_id>', methods=['GET'])
+def get_mastermind_session(session_id):
+    """Current state of a Mastermind game, with an optional next-guess hint"""
+    with _mastermind_sessions_lock:
+        session = _mastermind_sessions.get(session_id)
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown session'
+        }), 404
+    
+    state = _mastermind_session_state(session_id, session)
+    if request.args.get('hint', 'false').lower() == 'true' and not session.game_over:
+        state['hint'] = list(session.hint())
+    return jsonify(state)
+
+@app.route('/api/mastermind/session/<session_id>/guess', methods=['POST'])
+def submit_mastermind_guess(session_id):
+    """Score a guess in a Mastermind game"""
+    with _mastermind_sessions_lock:
+        session = _mastermind_sessions.get(session_id)
+        if session is not None:
+            _mastermind_sessions.move_to_end(session_id)
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown session'
+        }), 404
+    
+    try:
+        data = request.get_json() or {}
+        guess = data.get('guess')
+        if not isinstance(guess, list):
+            raise ValueError("guess must be a list of color indices.")
+        
+        exact, color_only = session.submit_guess(guess)
+        
+        state = _mastermind_session_state(session_id, session)
+        state['exact'] = exact
+        state['color_only'] = color_only
+        if str(data.get('hint', 'false')).lower() == 'true' and not session.game_over:
+            state['hint'] = list(session.hint())
+        return jsonify(state)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+# Upper bound on the per-board optimality search a client may ask for (a few seconds)
+MAX_OPTIMAL_NODE_LIMIT = 300_000
+
 @app.route('/api/generate/floodfill', methods=['GET', 'POST'])
 def generate_floodfill():
     """Generate a Floodfill/Mosaic puzzle"""
@@ -385,6 +571,9 @@ def generate_floodfill():
         ensure_solvable = data.get('ensure_solvable', 'true').lower() == 'true'
         max_tries = int(data.get('max_tries', 500))
         noise_blocks = int(data.get('noise_blocks', 14))
+        construction = data.get('construction', 'random')
+        slack = int(data.get('slack')) if data.get('slack') not in (None, '') else None
+        optimal_node_limit = min(int(data.get('optimal_node_limit', 30000)), MAX_OPTIMAL_NODE_LIMIT)
 
         puzzle = generate_mosaic(
             rows,
@@ -395,6 +584,9 @@ def generate_floodfill():
             ensure_solvable=ensure_solvable,
             max_tries=max_tries,
             noise_blocks=noise_blocks,
+            construction=construction,
+            slack=slack,
+            optimal_node_limit=optimal_node_limit,
         )
 
         return jsonify({
@@ -406,6 +598,7 @@ def generate_floodfill():
             'grid': [[int(puzzle.grid[r][c]) for c in range(puzzle.cols)] for r in range(puzzle.rows)],
             'solution': ([[int(r), int(c), int(new_color)] for (r, c, new_color) in puzzle.solution]
                          if puzzle.solution is not None else None),
+            'optimal_moves': puzzle.optimal_moves,
         })
     except Exception as e:
         return jsonify({
@@ -430,6 +623,7 @@ def generate_bridges():
         double_edge_chance = float(data.get('double_edge_chance', 0.35))
         seed = int(data.get('seed')) if data.get('seed') else None
         max_tries = int(data.get('max_tries', 500))
+        ensure_unique = data.get('ensure_unique', 'true').lower() == 'true'
 
         puzzle = generate_atoms(
             rows=rows,
@@ -439,6 +633,7 @@ def generate_bridges():
             double_edge_chance=double_edge_chance,
             seed=seed,
             max_tries=max_tries,
+            ensure_unique=ensure_unique,
         )
 
         nodes = [
@@ -456,6 +651,7 @@ def generate_bridges():
             'cols': puzzle.cols,
             'nodes': nodes,
             'solution_edges': solution_edges,
+            'attempts': puzzle.attempts,
         })
     except Exception as e:
         return jsonify({
@@ -479,6 +675,8 @@ def generate_numbersnake():
         seed = int(data.get('seed')) if data.get('seed') else None
         keep_endpoints_labeled = data.get('keep_endpoints_labeled', 'true').lower() == 'true'
         max_tries = int(data.get('max_tries', 2000))
+        ensure_unique = data.get('ensure_unique', 'true').lower() == 'true'
+        minimize_clues = data.get('minimize_clues', 'false').lower() == 'true'
 
         puzzle = generate_snap(
             rows,
@@ -487,6 +685,8 @@ def generate_numbersnake():
             seed=seed,
             keep_endpoints_labeled=keep_endpoints_labeled,
             max_tries=max_tries,
+            ensure_unique=ensure_unique,
+            minimize_clues=minimize_clues,
         )
 
         clues = [
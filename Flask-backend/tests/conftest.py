@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The generators are imported as top-level modules, the way app.py does it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Generators"))
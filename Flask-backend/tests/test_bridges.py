@@ -0,0 +1,97 @@
+"""count_bridges_solutions against brute force over every multiplicity assignment."""
+import itertools
+import random
+
+import pytest
+
+from Bridgesgen import DSU, _build_visibility_edges, count_bridges_solutions, generate_atoms
+
+
+def _interior(a, b):
+    (r1, c1), (r2, c2) = a, b
+    if r1 == r2:
+        return {(r1, c) for c in range(min(c1, c2) + 1, max(c1, c2))}, "h"
+    return {(r, c1) for r in range(min(r1, r2) + 1, max(r1, r2))}, "v"
+
+
+def _brute_solutions(points, degrees):
+    edges = _build_visibility_edges(points)
+    spans = [_interior(points[u], points[v]) for u, v in edges]
+    out = []
+    for mults in itertools.product((0, 1, 2), repeat=len(edges)):
+        deg = [0] * len(points)
+        for (u, v), m in zip(edges, mults):
+            deg[u] += m
+            deg[v] += m
+        if deg != degrees:
+            continue
+        used = [i for i, m in enumerate(mults) if m]
+        if any(spans[i][1] != spans[j][1] and spans[i][0] & spans[j][0] for i, j in itertools.combinations(used, 2)):
+            continue
+        dsu = DSU(len(points))
+        for i in used:
+            dsu.union(*edges[i])
+        if dsu.count == 1:
+            out.append({edges[i]: mults[i] for i in used})
+    return out
+
+
+def _cases(seed, count):
+    """(points, degrees, brute-force solutions); unsolvable cases are kept only now and then."""
+    rng = random.Random(seed)
+    while count:
+        rows, cols = rng.choice([(3, 3), (3, 4), (4, 4), (4, 5)])
+        k = rng.randint(2, 8)
+        points = sorted(rng.sample([(r, c) for r in range(rows) for c in range(cols)], k))
+        edges = _build_visibility_edges(points)
+        if len(edges) > 10:
+            continue
+        if rng.random() < 0.8:
+            # numbers of a bridge on every visible pair (crossings included), so
+            # solutions are common and dense boards give several
+            degrees = [0] * k
+            for u, v in edges:
+                m = rng.choice((1, 1, 2))
+                degrees[u] += m
+                degrees[v] += m
+        else:
+            degrees = [rng.randint(1, 4) for _ in range(k)]
+        expected = _brute_solutions(points, degrees)
+        if not expected and rng.random() < 0.75:
+            continue
+        count -= 1
+        yield points, degrees, expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_count_matches_brute_force(seed):
+    for points, degrees, expected in _cases(seed, 40):
+        found = []
+        assert count_bridges_solutions(points, degrees, limit=10**6, found=found) == len(expected)
+        assert sorted(sorted((e.u, e.v, e.count) for e in sol) for sol in found) == sorted(
+            sorted((u, v, m) for (u, v), m in sol.items()) for sol in expected
+        )
+        for limit in (1, 2):
+            assert count_bridges_solutions(points, degrees, limit=limit) == min(len(expected), limit)
+        if expected:
+            known = expected[-1]
+            assert count_bridges_solutions(points, degrees, limit=10**6, known=known) == len(expected)
+
+
+def test_generated_puzzles_are_unique():
+    for seed in range(10):
+        p = generate_atoms(6, 6, num_nodes=6, seed=seed)
+        points = [(n.r, n.c) for n in p.nodes]
+        if len(_build_visibility_edges(points)) <= 10:
+            assert len(_brute_solutions(points, [n.degree for n in p.nodes])) == 1
+
+
+@pytest.mark.parametrize("rows,cols,num_nodes", [(4, 4, 16), (6, 6, 30)])
+def test_dense_boards_generate(rows, cols, num_nodes):
+    for seed in range(10):
+        p = generate_atoms(rows, cols, num_nodes=num_nodes, seed=seed, ensure_unique=False)
+        assert len(p.nodes) == num_nodes
+        dsu = DSU(num_nodes)
+        for e in p.solution_edges:
+            dsu.union(e.u, e.v)
+        assert dsu.count == 1
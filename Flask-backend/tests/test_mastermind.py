@@ -0,0 +1,19 @@
+"""Config limits for Mastermind games and sessions."""
+import pytest
+
+from Mastermindgen import MastermindConfig, MastermindSecret, MastermindSession, generate_mastermind_secret
+
+
+def test_session_rejects_oversized_config():
+    cfg = MastermindConfig(code_len=8, num_colors=10, allow_repeats=True)
+    with pytest.raises(ValueError, match="possible codes"):
+        MastermindSession(MastermindSecret(config=cfg, code=(0,) * 8, max_attempts=10))
+    with pytest.raises(ValueError, match="possible codes"):
+        generate_mastermind_secret(config=cfg, seed=0)
+
+
+def test_session_accepts_largest_documented_config():
+    cfg = MastermindConfig(code_len=6, num_colors=8, allow_repeats=True)
+    session = MastermindSession(MastermindSecret(config=cfg, code=(0,) * 6, max_attempts=10))
+    session.submit_guess((0, 0, 1, 1, 2, 2))
+    assert session.candidates_remaining < 8 ** 6
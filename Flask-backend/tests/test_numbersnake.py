@@ -0,0 +1,127 @@
+"""count_snap_solutions against brute force over every Hamiltonian path."""
+import random
+from functools import lru_cache
+
+import pytest
+
+from Numbersnakegen import SnapClue, _neighbors, count_snap_solutions, generate_snap
+
+
+@lru_cache(maxsize=None)
+def _all_paths(rows, cols):
+    n = rows * cols
+    out = []
+
+    def dfs(path, used):
+        if len(path) == n:
+            out.append(tuple(path))
+            return
+        for nb in _neighbors(path[-1], rows, cols):
+            if nb not in used:
+                used.add(nb)
+                path.append(nb)
+                dfs(path, used)
+                path.pop()
+                used.discard(nb)
+
+    for r in range(rows):
+        for c in range(cols):
+            dfs([(r, c)], {(r, c)})
+    return out
+
+
+def _brute_solutions(rows, cols, clues, fixed):
+    value_at = {(cl.r, cl.c): cl.value for cl in clues}
+    k = len(clues)
+    out = []
+    for path in _all_paths(rows, cols):
+        if [value_at[cell] for cell in path if cell in value_at] != list(range(1, k + 1)):
+            continue
+        if fixed and (value_at.get(path[0]) != 1 or value_at.get(path[-1]) != k):
+            continue
+        out.append(list(path))
+    return out
+
+
+def _random_clues(rng, path, k, fixed):
+    n = len(path)
+    if fixed:
+        idxs = [0] + sorted(rng.sample(range(1, n - 1), k - 2)) + [n - 1]
+    else:
+        idxs = sorted(rng.sample(range(n), k))
+    values = list(range(1, k + 1))
+    if rng.random() < 0.25:
+        # out of path order, so usually unsolvable
+        i, j = rng.sample(range(k), 2)
+        values[i], values[j] = values[j], values[i]
+    return [SnapClue(value=v, r=path[j][0], c=path[j][1]) for v, j in zip(values, idxs)]
+
+
+@pytest.mark.parametrize("rows,cols", [(2, 3), (3, 3), (3, 4), (4, 4)])
+@pytest.mark.parametrize("fixed", [True, False])
+def test_count_matches_brute_force(rows, cols, fixed):
+    rng = random.Random(rows * 10 + cols)
+    paths = _all_paths(rows, cols)
+    for _ in range(40):
+        path = rng.choice(paths)
+        clues = _random_clues(rng, path, rng.randint(2, min(6, rows * cols)), fixed)
+        expected = _brute_solutions(rows, cols, clues, fixed)
+        found = []
+        assert count_snap_solutions(rows, cols, clues, endpoints_fixed=fixed, limit=10**6, found=found) == len(expected)
+        assert sorted(found) == sorted(expected)
+        assert count_snap_solutions(
+            rows, cols, clues, endpoints_fixed=fixed, known=list(path)
+        ) == min(len(expected), 2)
+
+
+@pytest.mark.parametrize("fixed", [True, False])
+def test_generated_puzzles_are_unique(fixed):
+    for seed in range(10):
+        p = generate_snap(4, 4, num_clues=5, seed=seed, keep_endpoints_labeled=fixed, ensure_unique=True)
+        assert _brute_solutions(4, 4, p.clues, fixed) == [p.solution_path]
+
+
+@pytest.mark.parametrize("fixed", [True, False])
+def test_shared_nogoods_keep_counts_exact(fixed):
+    # one cache across clue sets that share suffixes, as the clue removal loops use it
+    rows, cols = 4, 4
+    rng = random.Random(7)
+    paths = _all_paths(rows, cols)
+    for _ in range(4):
+        path = rng.choice(paths)
+        nogoods = {}
+        idxs = list(range(rows * cols))
+        rng.shuffle(idxs)
+        clued = set(range(rows * cols))
+        for j in idxs:
+            if fixed and j in (0, rows * cols - 1):
+                continue
+            clued.discard(j)
+            clues = [
+                SnapClue(value=v, r=path[i][0], c=path[i][1])
+                for v, i in enumerate(sorted(clued), start=1)
+            ]
+            expected = _brute_solutions(rows, cols, clues, fixed)
+            assert count_snap_solutions(
+                rows, cols, clues, endpoints_fixed=fixed, limit=10**6, nogoods=nogoods
+            ) == len(expected)
+            assert count_snap_solutions(
+                rows, cols, clues, endpoints_fixed=fixed, known=list(path), nogoods=nogoods
+            ) == min(len(expected), 2)
+
+
+def test_minimized_clues_are_unique_and_minimal():
+    for seed in range(6):
+        for fixed in (True, False):
+            p = generate_snap(4, 4, num_clues=2, seed=seed, keep_endpoints_labeled=fixed, minimize_clues=True)
+            assert _brute_solutions(4, 4, p.clues, fixed) == [p.solution_path]
+            droppable = p.clues[1:-1] if fixed else p.clues
+            for clue in droppable:
+                rest = [c for c in p.clues if c is not clue]
+                rest = [SnapClue(value=v, r=c.r, c=c.c) for v, c in enumerate(rest, start=1)]
+                assert len(_brute_solutions(4, 4, rest, fixed)) > 1
+
+
+def test_too_few_clues_fail_fast():
+    with pytest.raises(RuntimeError, match="too few"):
+        generate_snap(7, 7, num_clues=4, seed=0, ensure_unique=True)
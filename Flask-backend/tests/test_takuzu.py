@@ -0,0 +1,73 @@
+"""_solve_count_solutions against brute force over every valid grid."""
+import itertools
+import random
+from functools import lru_cache
+
+import pytest
+
+from Takuzugen import EMPTY, _solve_count_solutions, generate_binary_puzzle
+
+
+def _valid_line(line):
+    return 2 * sum(line) == len(line) and all(
+        not line[i] == line[i + 1] == line[i + 2] for i in range(len(line) - 2)
+    )
+
+
+@lru_cache(maxsize=None)
+def _all_grids(rows, cols):
+    lines = [line for line in itertools.product((0, 1), repeat=cols) if _valid_line(line)]
+    out = []
+    for grid in itertools.product(lines, repeat=rows):
+        if len(set(grid)) < rows:
+            continue
+        columns = list(zip(*grid))
+        if all(_valid_line(col) for col in columns) and len(set(columns)) == cols:
+            out.append(grid)
+    return out
+
+
+def _brute_solutions(puzzle):
+    rows, cols = len(puzzle), len(puzzle[0])
+    return [
+        [list(row) for row in grid]
+        for grid in _all_grids(rows, cols)
+        if all(puzzle[r][c] in (EMPTY, grid[r][c]) for r in range(rows) for c in range(cols))
+    ]
+
+
+@pytest.mark.parametrize("rows,cols", [(4, 4), (4, 6), (6, 4)])
+def test_count_matches_brute_force(rows, cols):
+    rng = random.Random(rows * 10 + cols)
+    grids = _all_grids(rows, cols)
+    for _ in range(150):
+        if rng.random() < 0.2:
+            # random givens, often contradictory
+            puzzle = [[rng.choice((EMPTY, EMPTY, 0, 1)) for _ in range(cols)] for _ in range(rows)]
+        else:
+            solution = rng.choice(grids)
+            keep = rng.random()
+            puzzle = [[v if rng.random() < keep else EMPTY for v in row] for row in solution]
+        before = [row[:] for row in puzzle]
+        expected = _brute_solutions(puzzle)
+        found = []
+        assert _solve_count_solutions(puzzle, limit=10**6, found=found) == len(expected)
+        assert sorted(found) == sorted(expected)
+        for limit in (1, 2):
+            assert _solve_count_solutions(puzzle, limit=limit) == min(len(expected), limit)
+        assert puzzle == before
+
+
+@pytest.mark.parametrize("strategy", ["count", "deduce"])
+def test_generated_puzzles_are_unique(strategy):
+    for seed in range(10):
+        for rows, cols in ((4, 4), (4, 6), (6, 4)):
+            puzzle, solution = generate_binary_puzzle(rows, cols=cols, seed=seed, removal_strategy=strategy)
+            assert _brute_solutions(puzzle) == [solution]
+
+
+def test_count_is_rejected_on_large_sparse_boards():
+    with pytest.raises(ValueError, match="givens_ratio >= 0.45"):
+        generate_binary_puzzle(20, givens_ratio=0.25, removal_strategy="count")
+    with pytest.raises(ValueError, match="givens_ratio >= 0.4"):
+        generate_binary_puzzle(16, givens_ratio=0.3, removal_strategy="count")